@@ -0,0 +1,26 @@
+"""
+FraudShield AI - API Dependencies
+Shared FastAPI dependencies for the routers
+"""
+
+from typing import Optional
+
+from fastapi import HTTPException
+
+from .services.fraud_service import FraudService
+
+# Bound by the application lifespan (set on startup, cleared on shutdown)
+_fraud_service: Optional[FraudService] = None
+
+
+def set_fraud_service(service: Optional[FraudService]) -> None:
+    """Bind (or unbind with None) the fraud service served to the routers."""
+    global _fraud_service
+    _fraud_service = service
+
+
+async def get_fraud_service() -> FraudService:
+    """Dependency injection for fraud service."""
+    if _fraud_service is None:
+        raise HTTPException(status_code=503, detail="Service not initialized")
+    return _fraud_service
@@ -12,12 +12,14 @@ Features:
 
 from fastapi import FastAPI, HTTPException, BackgroundTasks, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from contextlib import asynccontextmanager
+from fastapi.responses import ORJSONResponse
+from contextlib import asynccontextmanager, suppress
 from typing import Dict, Any, List, Optional
-from datetime import datetime
 import asyncio
+import os
+import traceback
 import uuid
+import orjson
 
 from .routers import transactions, documents, investigations, analytics, agents, alerts, settings
 from .models.requests import (
@@ -31,8 +33,11 @@ from .models.responses import (
     BatchResultResponse,
     HealthResponse,
 )
+from .dependencies import set_fraud_service
 from .services.fraud_service import FraudService
 from .services.websocket_manager import WebSocketManager
+from .services.settings_service import close_settings_service
+from .utils.clock import now_iso
 
 # WebSocket manager for real-time updates
 ws_manager = WebSocketManager()
@@ -50,12 +55,19 @@ async def lifespan(app: FastAPI):
     print("[START] Starting FraudShield AI Backend...")
     fraud_service = FraudService()
     await fraud_service.initialize()
+    set_fraud_service(fraud_service)
+    agents_refresh_task = asyncio.create_task(agents.refresh_agent_snapshot(fraud_service))
     print("[READY] FraudShield AI Backend ready")
 
     yield
 
     # Shutdown
     print("[STOP] Shutting down FraudShield AI Backend...")
+    set_fraud_service(None)
+    agents_refresh_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await agents_refresh_task
+    await close_settings_service()
     if fraud_service:
         await fraud_service.shutdown()
 
@@ -82,12 +94,25 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration
+# Explicit origins only: browsers reject "*" when credentials are allowed
+CORS_ORIGINS = [
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001").split(",")
+    if origin.strip()
+]
+
+# Any local dev port is allowed only when no origin list is configured
+# (dev default); deployments get an exact-match lookup on CORS_ORIGINS only
+CORS_ORIGIN_REGEX = None if os.getenv("CORS_ORIGINS") else r"^http://(localhost|127\.0\.0\.1):\d+$"
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:3001", "*"],
+    allow_origins=CORS_ORIGINS,
+    allow_origin_regex=CORS_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -110,7 +135,7 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         version="1.0.0",
-        timestamp=datetime.now().isoformat(),
+        timestamp=now_iso(),
         services={
             "fraud_service": fraud_service is not None,
             "websocket": True,
@@ -127,18 +152,19 @@ async def readiness_check():
 
 
 # WebSocket endpoint for real-time updates
+# Ack frame is constant: encode it once instead of once per message
+_WS_ACK = orjson.dumps({"type": "ack", "message": "received"})
+
+
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint(websocket: WebSocket, client_id: str):
     """WebSocket pour les mises à jour en temps réel."""
     await ws_manager.connect(websocket, client_id)
     try:
         while True:
-            data = await websocket.receive_text()
+            await websocket.receive_text()
             # Handle incoming messages if needed
-            await ws_manager.send_personal_message(
-                {"type": "ack", "message": "received"},
-                client_id
-            )
+            await ws_manager.send_personal_message(_WS_ACK, client_id)
     except WebSocketDisconnect:
         ws_manager.disconnect(client_id)
 
@@ -155,7 +181,7 @@ async def quick_fraud_check(request: TransactionRequest):
         raise HTTPException(status_code=503, detail="Service not initialized")
 
     result = await fraud_service.process_transaction(
-        transaction=request.transaction.dict(),
+        transaction=request.transaction.model_dump(),
         workflow="quick"
     )
 
@@ -169,32 +195,60 @@ async def quick_fraud_check(request: TransactionRequest):
 
 
 # Error handlers
+# Error details are bounded so oversized exception messages cannot inflate
+# the cost of every error response
+_MAX_ERROR_DETAIL_CHARS = 512
+
+
+def _truncate_detail(detail: Any) -> Any:
+    """Tronque les messages d'erreur trop longs."""
+    if isinstance(detail, str) and len(detail) > _MAX_ERROR_DETAIL_CHARS:
+        return detail[:_MAX_ERROR_DETAIL_CHARS]
+    return detail
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
-            "error": exc.detail,
+            "error": _truncate_detail(exc.detail),
             "status_code": exc.status_code,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
         }
     )
 
 
 @app.exception_handler(Exception)
 async def general_exception_handler(request, exc):
-    return JSONResponse(
+    # Full traceback goes to the server log, not into the response
+    print(f"[ERROR] Unhandled exception on {request.method} {request.url.path}")
+    traceback.print_exception(type(exc), exc, exc.__traceback__)
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
-            "detail": str(exc),
-            "timestamp": datetime.now().isoformat(),
+            "detail": str(exc)[:_MAX_ERROR_DETAIL_CHARS],
+            "timestamp": now_iso(),
         }
     )
 
 
-def get_fraud_service() -> FraudService:
-    """Dependency to get fraud service."""
-    if fraud_service is None:
-        raise HTTPException(status_code=503, detail="Service not initialized")
-    return fraud_service
+if __name__ == "__main__":
+    import uvicorn
+
+    # uvloop + httptools (shipped with uvicorn[standard]); keep-alive and
+    # WebSocket limits sized for many long-lived dashboard connections
+    uvicorn.run(
+        "backend.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WORKERS", "1")),
+        loop="uvloop",
+        http="httptools",
+        backlog=2048,
+        timeout_keep_alive=75,
+        ws_ping_interval=30,
+        ws_ping_timeout=60,
+        ws_max_size=2**20,
+    )
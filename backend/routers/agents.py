@@ -3,22 +3,194 @@ FraudShield AI - Agents Router
 API endpoints for agent management and monitoring
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
-from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import time
+import orjson
 
 from ..models.responses import AgentStatusResponse, SystemStatusResponse
+from ..dependencies import get_fraud_service
 from ..services.fraud_service import FraudService
+from ..utils.clock import now_iso
 
 router = APIRouter()
 
 
-def get_fraud_service() -> FraudService:
-    """Dependency injection for fraud service."""
-    from ..main import fraud_service
-    if fraud_service is None:
-        raise HTTPException(status_code=503, detail="Service not initialized")
-    return fraud_service
+# =============================================================================
+# STATIC PAYLOADS
+# =============================================================================
+
+_AGENT_CONFIG: Dict[str, Any] = {
+    "orchestrator": {
+        "model": "gemini-flash-latest",
+        "sub_agents": [
+            "document_analyst",
+            "transaction_analyst",
+            "identity_verifier",
+            "pattern_detector",
+            "network_analyzer",
+            "explanation_generator"
+        ]
+    },
+    "cost_matrix": {
+        "true_positive": 10.0,
+        "true_negative": 1.0,
+        "false_positive": -5.0,
+        "false_negative": -50.0,
+    },
+    "thresholds": {
+        "fraud_threshold": 0.7,
+        "alert_threshold": 0.5,
+        "auto_approve_threshold": 0.2,
+    },
+    "features": {
+        "llm_enabled": True,
+        "rl_enabled": True,
+        "xai_enabled": True,
+        "batch_processing": True,
+    },
+    "workflows": {
+        "quick": "Transaction scoring only",
+        "standard": "Full analysis pipeline",
+        "investigation": "Deep analysis with report",
+        "batch": "Bulk processing"
+    }
+}
+_AGENT_CONFIG_BYTES = orjson.dumps(_AGENT_CONFIG)
+
+_MCP_SERVERS = [
+    ("database_server", "Database MCP Server", ["query_transactions", "query_entities", "query_alerts"]),
+    ("documents_server", "Documents MCP Server", ["analyze_document", "detect_tampering", "extract_text"]),
+    ("fraud_server", "Fraud MCP Server", ["score_transaction", "detect_patterns", "calculate_risk"]),
+    ("identity_server", "Identity MCP Server", ["verify_rnipp", "check_sanctions", "validate_rib"]),
+]
+
+_A2A_RECENT_MESSAGES = [
+    ("msg-001", "orchestrator", "transaction_analyst", "ANALYZE_REQUEST", "processed"),
+    ("msg-002", "transaction_analyst", "pattern_detector", "PATTERN_CHECK", "processed"),
+    ("msg-003", "pattern_detector", "orchestrator", "PATTERN_RESULT", "delivered"),
+]
+
+# Timestamped payloads are rebuilt at most once per TTL window
+_PAYLOAD_TTL_SECONDS = 1.0
+_payload_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+
+def _cached_payload(key: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Retourne le payload en cache, reconstruit apres expiration du TTL."""
+    now = time.monotonic()
+    cached = _payload_cache.get(key)
+    if cached is None or now >= cached[0]:
+        cached = (now + _PAYLOAD_TTL_SECONDS, build())
+        _payload_cache[key] = cached
+    return cached[1]
+
+
+def _build_mcp_servers() -> Dict[str, Any]:
+    """Construit la liste des serveurs MCP."""
+    timestamp = now_iso()
+    return {
+        "servers": [
+            {
+                "server_id": server_id,
+                "name": name,
+                "status": "connected",
+                "tools": tools,
+                "last_ping": timestamp
+            }
+            for server_id, name, tools in _MCP_SERVERS
+        ]
+    }
+
+
+def _build_a2a_status() -> Dict[str, Any]:
+    """Construit le statut du protocole A2A."""
+    timestamp = now_iso()
+    return {
+        "protocol_version": "1.0",
+        "status": "active",
+        "total_messages": 1247,
+        "messages_last_hour": 45,
+        "average_latency_ms": 12,
+        "recent_messages": [
+            {
+                "message_id": message_id,
+                "from_agent": from_agent,
+                "to_agent": to_agent,
+                "message_type": message_type,
+                "status": status,
+                "timestamp": timestamp
+            }
+            for message_id, from_agent, to_agent, message_type, status in _A2A_RECENT_MESSAGES
+        ]
+    }
+
+
+# =============================================================================
+# AGENT SNAPSHOT
+# =============================================================================
+
+# Dashboards poll /list far more often than the registry changes: a
+# background task rebuilds the list and requests are served from it
+_AGENT_REFRESH_INTERVAL_SECONDS = 2.0
+_cached_agents: List[AgentStatusResponse] = []
+_agents_by_id: Dict[str, AgentStatusResponse] = {}
+_agents_etag: Optional[str] = None
+
+
+# Whole list validated in one pydantic-core call instead of N constructors
+_AGENT_LIST_ADAPTER = TypeAdapter(List[AgentStatusResponse])
+
+_AGENT_DEFAULTS: Dict[str, Any] = {
+    "agent_id": "",
+    "agent_name": "",
+    "status": "unknown",
+    "is_healthy": False,
+    "capabilities": [],
+    "supported_tasks": [],
+    "last_heartbeat": None,
+}
+
+
+def _with_defaults(agent: Dict[str, Any]) -> Dict[str, Any]:
+    """Complete une entree du registre avec les valeurs par defaut."""
+    return {**_AGENT_DEFAULTS, **agent}
+
+
+def _refresh_agent_snapshot(service: FraudService):
+    """Reconstruit la liste des agents et son ETag."""
+    global _cached_agents, _agents_by_id, _agents_etag
+
+    agents = _AGENT_LIST_ADAPTER.validate_python(
+        [_with_defaults(agent) for agent in service.get_agent_status()]
+    )
+    body = orjson.dumps([agent.model_dump() for agent in agents], default=str)
+
+    _cached_agents = agents
+    _agents_by_id = {agent.agent_id: agent for agent in agents}
+    _agents_etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+def _get_agent_index(service: FraudService) -> Dict[str, AgentStatusResponse]:
+    """Retourne l'index agent_id -> agent du snapshot courant."""
+    if _agents_etag is None:
+        # Refresh task not started yet (first request after startup)
+        _refresh_agent_snapshot(service)
+    return _agents_by_id
+
+
+async def refresh_agent_snapshot(service: FraudService):
+    """Tache de fond: rafraichit periodiquement la liste des agents."""
+    while True:
+        try:
+            _refresh_agent_snapshot(service)
+        except Exception as e:
+            print(f"[WARN] Agent snapshot refresh failed: {e}")
+        await asyncio.sleep(_AGENT_REFRESH_INTERVAL_SECONDS)
 
 
 @router.get("/status", response_model=SystemStatusResponse)
@@ -41,25 +213,22 @@ async def get_system_status(
 
 @router.get("/list", response_model=List[AgentStatusResponse])
 async def list_agents(
+    request: Request,
+    response: Response,
     service: FraudService = Depends(get_fraud_service)
 ):
     """
     Lister tous les agents enregistrés.
     """
-    agents = service.get_agent_status()
+    if _agents_etag is None:
+        # Refresh task not started yet (first request after startup)
+        _refresh_agent_snapshot(service)
+
+    if request.headers.get("if-none-match") == _agents_etag:
+        return Response(status_code=304, headers={"ETag": _agents_etag})
 
-    return [
-        AgentStatusResponse(
-            agent_id=agent.get("agent_id", ""),
-            agent_name=agent.get("agent_name", ""),
-            status=agent.get("status", "unknown"),
-            is_healthy=agent.get("is_healthy", False),
-            capabilities=agent.get("capabilities", []),
-            supported_tasks=agent.get("supported_tasks", []),
-            last_heartbeat=agent.get("last_heartbeat")
-        )
-        for agent in agents
-    ]
+    response.headers["ETag"] = _agents_etag
+    return _cached_agents
 
 
 @router.get("/model/info")
@@ -82,7 +251,7 @@ async def trigger_training(
     # In production, would trigger async training job
     return {
         "status": "training_triggered",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": now_iso(),
         "note": "Training runs in background"
     }
 
@@ -94,42 +263,7 @@ async def get_agent_config(
     """
     Récupérer la configuration des agents.
     """
-    return {
-        "orchestrator": {
-            "model": "gemini-flash-latest",
-            "sub_agents": [
-                "document_analyst",
-                "transaction_analyst",
-                "identity_verifier",
-                "pattern_detector",
-                "network_analyzer",
-                "explanation_generator"
-            ]
-        },
-        "cost_matrix": {
-            "true_positive": 10.0,
-            "true_negative": 1.0,
-            "false_positive": -5.0,
-            "false_negative": -50.0,
-        },
-        "thresholds": {
-            "fraud_threshold": 0.7,
-            "alert_threshold": 0.5,
-            "auto_approve_threshold": 0.2,
-        },
-        "features": {
-            "llm_enabled": True,
-            "rl_enabled": True,
-            "xai_enabled": True,
-            "batch_processing": True,
-        },
-        "workflows": {
-            "quick": "Transaction scoring only",
-            "standard": "Full analysis pipeline",
-            "investigation": "Deep analysis with report",
-            "batch": "Bulk processing"
-        }
-    }
+    return Response(content=_AGENT_CONFIG_BYTES, media_type="application/json")
 
 
 @router.get("/mcp-servers")
@@ -139,38 +273,7 @@ async def list_mcp_servers(
     """
     Lister les serveurs MCP disponibles.
     """
-    return {
-        "servers": [
-            {
-                "server_id": "database_server",
-                "name": "Database MCP Server",
-                "status": "connected",
-                "tools": ["query_transactions", "query_entities", "query_alerts"],
-                "last_ping": datetime.now().isoformat()
-            },
-            {
-                "server_id": "documents_server",
-                "name": "Documents MCP Server",
-                "status": "connected",
-                "tools": ["analyze_document", "detect_tampering", "extract_text"],
-                "last_ping": datetime.now().isoformat()
-            },
-            {
-                "server_id": "fraud_server",
-                "name": "Fraud MCP Server",
-                "status": "connected",
-                "tools": ["score_transaction", "detect_patterns", "calculate_risk"],
-                "last_ping": datetime.now().isoformat()
-            },
-            {
-                "server_id": "identity_server",
-                "name": "Identity MCP Server",
-                "status": "connected",
-                "tools": ["verify_rnipp", "check_sanctions", "validate_rib"],
-                "last_ping": datetime.now().isoformat()
-            }
-        ]
-    }
+    return _cached_payload("mcp_servers", _build_mcp_servers)
 
 
 @router.get("/a2a/status")
@@ -180,39 +283,7 @@ async def get_a2a_status(
     """
     Récupérer le statut du protocole A2A.
     """
-    return {
-        "protocol_version": "1.0",
-        "status": "active",
-        "total_messages": 1247,
-        "messages_last_hour": 45,
-        "average_latency_ms": 12,
-        "recent_messages": [
-            {
-                "message_id": "msg-001",
-                "from_agent": "orchestrator",
-                "to_agent": "transaction_analyst",
-                "message_type": "ANALYZE_REQUEST",
-                "status": "processed",
-                "timestamp": datetime.now().isoformat()
-            },
-            {
-                "message_id": "msg-002",
-                "from_agent": "transaction_analyst",
-                "to_agent": "pattern_detector",
-                "message_type": "PATTERN_CHECK",
-                "status": "processed",
-                "timestamp": datetime.now().isoformat()
-            },
-            {
-                "message_id": "msg-003",
-                "from_agent": "pattern_detector",
-                "to_agent": "orchestrator",
-                "message_type": "PATTERN_RESULT",
-                "status": "delivered",
-                "timestamp": datetime.now().isoformat()
-            }
-        ]
-    }
+    return _cached_payload("a2a_status", _build_a2a_status)
 
 
 # Dynamic route MUST be at the end to not catch static routes
@@ -224,18 +295,7 @@ async def get_agent(
     """
     Récupérer les détails d'un agent spécifique.
     """
-    agents = service.get_agent_status()
-
-    for agent in agents:
-        if agent.get("agent_id") == agent_id:
-            return AgentStatusResponse(
-                agent_id=agent.get("agent_id", ""),
-                agent_name=agent.get("agent_name", ""),
-                status=agent.get("status", "unknown"),
-                is_healthy=agent.get("is_healthy", False),
-                capabilities=agent.get("capabilities", []),
-                supported_tasks=agent.get("supported_tasks", []),
-                last_heartbeat=agent.get("last_heartbeat")
-            )
-
-    raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+    agent = _get_agent_index(service).get(agent_id)
+    if agent is None:
+        raise HTTPException(status_code=404, detail=f"Agent {agent_id} not found")
+    return agent
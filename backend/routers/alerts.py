@@ -4,10 +4,16 @@ Endpoints for alert management
 """
 
 from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any, Literal
-from datetime import datetime, timedelta
+from fastapi.responses import Response
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Optional, Dict, Any, Literal, Tuple
+from datetime import date, datetime, timedelta
+from collections import defaultdict
+from itertools import islice
+import bisect
+import secrets
 import uuid
+import orjson
 
 router = APIRouter()
 
@@ -24,7 +30,7 @@ class AlertAction(BaseModel):
     action_type: AlertActionType
     description: str
     performed_by: str
-    performed_at: str
+    performed_at: datetime
 
 
 class Alert(BaseModel):
@@ -39,16 +45,19 @@ class Alert(BaseModel):
     entity_type: AlertEntityType
     entity_id: str
     risk_score: float
-    created_at: str
-    updated_at: str
-    acknowledged_at: Optional[str] = None
-    resolved_at: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    acknowledged_at: Optional[datetime] = None
+    resolved_at: Optional[datetime] = None
     acknowledged_by: Optional[str] = None
     resolved_by: Optional[str] = None
     related_transactions: List[str] = []
     metadata: Dict[str, Any] = {}
     actions_taken: List[AlertAction] = []
 
+    # Serialized form reused by the list endpoint, reset on every mutation
+    _cached_json: Optional[bytes] = PrivateAttr(default=None)
+
 
 class AlertListResponse(BaseModel):
     alerts: List[Alert]
@@ -104,8 +113,8 @@ mock_alerts: List[Alert] = [
         entity_type="transaction",
         entity_id="TXN-2024-0891",
         risk_score=0.92,
-        created_at=datetime.now().isoformat(),
-        updated_at=datetime.now().isoformat(),
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
         related_transactions=["TXN-2024-0891"],
         metadata={"threshold": 10000, "actual": 45000},
         actions_taken=[],
@@ -122,9 +131,9 @@ mock_alerts: List[Alert] = [
         entity_type="network",
         entity_id="NET-2024-045",
         risk_score=0.85,
-        created_at=(datetime.now() - timedelta(hours=2)).isoformat(),
-        updated_at=datetime.now().isoformat(),
-        acknowledged_at=(datetime.now() - timedelta(hours=1)).isoformat(),
+        created_at=datetime.now() - timedelta(hours=2),
+        updated_at=datetime.now(),
+        acknowledged_at=datetime.now() - timedelta(hours=1),
         acknowledged_by="Marie Dupont",
         related_transactions=["TXN-2024-0878", "TXN-2024-0879", "TXN-2024-0880"],
         metadata={"ip_address": "192.168.1.100", "beneficiary_count": 5},
@@ -134,7 +143,7 @@ mock_alerts: List[Alert] = [
                 action_type="acknowledge",
                 description="Alerte prise en compte",
                 performed_by="Marie Dupont",
-                performed_at=(datetime.now() - timedelta(hours=1)).isoformat(),
+                performed_at=datetime.now() - timedelta(hours=1),
             )
         ],
     ),
@@ -150,9 +159,9 @@ mock_alerts: List[Alert] = [
         entity_type="transaction",
         entity_id="TXN-2024-0895",
         risk_score=0.87,
-        created_at=(datetime.now() - timedelta(hours=3)).isoformat(),
-        updated_at=(datetime.now() - timedelta(hours=2)).isoformat(),
-        acknowledged_at=(datetime.now() - timedelta(hours=2)).isoformat(),
+        created_at=datetime.now() - timedelta(hours=3),
+        updated_at=datetime.now() - timedelta(hours=2),
+        acknowledged_at=datetime.now() - timedelta(hours=2),
         acknowledged_by="Jean Martin",
         related_transactions=["TXN-2024-0895"],
         metadata={"model_version": "2.1", "confidence": 0.92},
@@ -170,9 +179,9 @@ mock_alerts: List[Alert] = [
         entity_type="document",
         entity_id="DOC-2024-1234",
         risk_score=0.65,
-        created_at=(datetime.now() - timedelta(days=1)).isoformat(),
-        updated_at=(datetime.now() - timedelta(hours=8)).isoformat(),
-        resolved_at=(datetime.now() - timedelta(hours=8)).isoformat(),
+        created_at=datetime.now() - timedelta(days=1),
+        updated_at=datetime.now() - timedelta(hours=8),
+        resolved_at=datetime.now() - timedelta(hours=8),
         resolved_by="Sophie Bernard",
         related_transactions=["TXN-2024-0867"],
         metadata={"document_type": "attestation", "match_score": 0.23},
@@ -182,14 +191,14 @@ mock_alerts: List[Alert] = [
                 action_type="investigate",
                 description="Verification manuelle du document",
                 performed_by="Sophie Bernard",
-                performed_at=(datetime.now() - timedelta(hours=16)).isoformat(),
+                performed_at=datetime.now() - timedelta(hours=16),
             ),
             AlertAction(
                 id="a3",
                 action_type="resolve",
                 description="Faux positif confirme - document valide",
                 performed_by="Sophie Bernard",
-                performed_at=(datetime.now() - timedelta(hours=8)).isoformat(),
+                performed_at=datetime.now() - timedelta(hours=8),
             ),
         ],
     ),
@@ -205,8 +214,8 @@ mock_alerts: List[Alert] = [
         entity_type="beneficiary",
         entity_id="BEN-789456",
         risk_score=0.72,
-        created_at=(datetime.now() - timedelta(hours=5)).isoformat(),
-        updated_at=(datetime.now() - timedelta(hours=5)).isoformat(),
+        created_at=datetime.now() - timedelta(hours=5),
+        updated_at=datetime.now() - timedelta(hours=5),
         related_transactions=["TXN-2024-0850", "TXN-2024-0865", "TXN-2024-0890"],
         metadata={"alert_count_30d": 3, "total_amount": 15000},
         actions_taken=[],
@@ -223,9 +232,9 @@ mock_alerts: List[Alert] = [
         entity_type="network",
         entity_id="NET-2024-089",
         risk_score=0.95,
-        created_at=(datetime.now() - timedelta(hours=6)).isoformat(),
-        updated_at=(datetime.now() - timedelta(hours=2)).isoformat(),
-        acknowledged_at=(datetime.now() - timedelta(hours=5)).isoformat(),
+        created_at=datetime.now() - timedelta(hours=6),
+        updated_at=datetime.now() - timedelta(hours=2),
+        acknowledged_at=datetime.now() - timedelta(hours=5),
         acknowledged_by="Marie Dupont",
         related_transactions=["TXN-2024-0800", "TXN-2024-0801", "TXN-2024-0802", "TXN-2024-0803"],
         metadata={"beneficiary_count": 12, "shared_iban": "FR76***456"},
@@ -235,13 +244,139 @@ mock_alerts: List[Alert] = [
                 action_type="escalate",
                 description="Escalade vers equipe investigation",
                 performed_by="Marie Dupont",
-                performed_at=(datetime.now() - timedelta(hours=4)).isoformat(),
+                performed_at=datetime.now() - timedelta(hours=4),
             )
         ],
     ),
 ]
 
 
+# Lookup indexes - alerts can be addressed by internal id or by alert_id
+_by_id: Dict[str, Alert] = {a.id: a for a in mock_alerts}
+_by_alert_id: Dict[str, Alert] = {a.alert_id: a for a in mock_alerts}
+
+
+def _find_alert(alert_id: str) -> Optional[Alert]:
+    """Retrouve une alerte par id ou alert_id."""
+    return _by_id.get(alert_id) or _by_alert_id.get(alert_id)
+
+
+# Filter buckets - one list per field value, kept in mock_alerts order
+_position: Dict[str, int] = {a.id: i for i, a in enumerate(mock_alerts)}
+_by_severity: Dict[str, List[Alert]] = defaultdict(list)
+_by_status: Dict[str, List[Alert]] = defaultdict(list)
+_by_type: Dict[str, List[Alert]] = defaultdict(list)
+_by_entity_type: Dict[str, List[Alert]] = defaultdict(list)
+_search_blobs: Dict[str, str] = {}
+
+for _a in mock_alerts:
+    _by_severity[_a.severity].append(_a)
+    _by_status[_a.status].append(_a)
+    _by_type[_a.type].append(_a)
+    _by_entity_type[_a.entity_type].append(_a)
+    _search_blobs[_a.id] = f"{_a.alert_id}\n{_a.title}\n{_a.description}".lower()
+del _a
+
+
+# Bound on the per-alert action history kept in memory
+_MAX_ACTIONS_PER_ALERT = 200
+
+# Status reached by each alert action
+_STATUS_MAP: Dict[str, str] = {
+    "acknowledge": "acknowledged",
+    "investigate": "investigating",
+    "resolve": "resolved",
+    "dismiss": "dismissed",
+}
+
+# Statistics counters - maintained incrementally by the mutation endpoints
+# so that /stats never has to scan mock_alerts
+_INACTIVE_STATUSES = ("resolved", "dismissed")
+_alert_counters: Dict[str, int] = {}
+_today_cache: Tuple[Optional[date], int, int] = (None, 0, 0)
+
+
+def _count_alert(alert: Alert, delta: int) -> None:
+    """Ajoute (ou retire) une alerte des compteurs de statut."""
+    _alert_counters[alert.status] = _alert_counters.get(alert.status, 0) + delta
+    if alert.status not in _INACTIVE_STATUSES:
+        _alert_counters["active"] += delta
+        if alert.severity == "critical":
+            _alert_counters["critical"] += delta
+
+
+def _rebuild_counters() -> None:
+    """Recalcule les compteurs de statut en une seule passe."""
+    _alert_counters.clear()
+    _alert_counters.update({"active": 0, "critical": 0})
+    for a in mock_alerts:
+        _count_alert(a, 1)
+
+
+def _today_counts() -> Tuple[int, int]:
+    """Retourne (resolved_today, new_today), recalcules une fois par jour."""
+    global _today_cache
+    today = datetime.now().date()
+    if _today_cache[0] != today:
+        resolved = new = 0
+        for a in mock_alerts:
+            if a.resolved_at and a.resolved_at.date() == today:
+                resolved += 1
+            if a.created_at.date() == today:
+                new += 1
+        _today_cache = (today, resolved, new)
+    return _today_cache[1], _today_cache[2]
+
+
+def _encode_alert(alert: Alert) -> bytes:
+    """Retourne le JSON de l'alerte, mis en cache jusqu'a sa prochaine modification."""
+    encoded = alert._cached_json
+    if encoded is None:
+        encoded = alert._cached_json = orjson.dumps(alert.model_dump())
+    return encoded
+
+
+def _record_action(alert: Alert, action: AlertAction) -> None:
+    """Ajoute une action a l'historique en ne gardant que les plus recentes."""
+    alert.actions_taken.append(action)
+    if len(alert.actions_taken) > _MAX_ACTIONS_PER_ALERT:
+        del alert.actions_taken[:-_MAX_ACTIONS_PER_ALERT]
+
+
+def _touch(alert: Alert, now: datetime) -> None:
+    """Horodate la modification et invalide le JSON en cache."""
+    alert.updated_at = now
+    alert._cached_json = None
+
+
+def _set_status(alert: Alert, status: str) -> None:
+    """Change le statut d'une alerte en maintenant les compteurs."""
+    if alert.status == status:
+        return
+    _count_alert(alert, -1)
+    _by_status[alert.status].remove(alert)
+    alert.status = status
+    bisect.insort(_by_status[status], alert, key=lambda a: _position[a.id])
+    _count_alert(alert, 1)
+
+
+def _mark_resolved(alert: Alert, resolved_at: datetime) -> None:
+    """Renseigne resolved_at et met a jour le compteur du jour."""
+    global _today_cache
+    previous = alert.resolved_at
+    alert.resolved_at = resolved_at
+    cached_day, resolved, new = _today_cache
+    if cached_day is None:
+        return
+    was_today = previous is not None and previous.date() == cached_day
+    is_today = resolved_at.date() == cached_day
+    if is_today and not was_today:
+        _today_cache = (cached_day, resolved + 1, new)
+
+
+_rebuild_counters()
+
+
 @router.get("", response_model=AlertListResponse)
 async def get_alerts(
     page: int = Query(1, ge=1),
@@ -253,65 +388,66 @@ async def get_alerts(
     search: Optional[str] = None,
 ):
     """Recupere la liste des alertes avec filtres et pagination."""
-    filtered = mock_alerts.copy()
-
-    if severity:
-        filtered = [a for a in filtered if a.severity == severity]
-    if status:
-        filtered = [a for a in filtered if a.status == status]
-    if type:
-        filtered = [a for a in filtered if a.type == type]
-    if entity_type:
-        filtered = [a for a in filtered if a.entity_type == entity_type]
-    if search:
-        search_lower = search.lower()
-        filtered = [
-            a for a in filtered
-            if search_lower in a.alert_id.lower()
-            or search_lower in a.title.lower()
-            or search_lower in a.description.lower()
-        ]
-
-    total = len(filtered)
+    filters = [
+        (attr, value, index)
+        for attr, value, index in (
+            ("severity", severity, _by_severity),
+            ("status", status, _by_status),
+            ("type", type, _by_type),
+            ("entity_type", entity_type, _by_entity_type),
+        )
+        if value
+    ]
+
+    # Start from the most selective bucket, check the other filters on it
+    source: List[Alert] = mock_alerts
+    if filters:
+        narrowest = min(filters, key=lambda f: len(f[2].get(f[1], ())))
+        source = narrowest[2].get(narrowest[1], [])
+        filters.remove(narrowest)
+
     start = (page - 1) * limit
     end = start + limit
-    paginated = filtered[start:end]
 
-    return AlertListResponse(
-        alerts=paginated,
-        total=total,
-        page=page,
-        limit=limit,
+    if not filters and not search:
+        total = len(source)
+        paginated = source[start:end]
+    else:
+        search_lower = search.lower() if search else None
+
+        def _match(a: Alert) -> bool:
+            if any(getattr(a, attr) != value for attr, value, _ in filters):
+                return False
+            return not search_lower or search_lower in _search_blobs[a.id]
+
+        # Count and page by streaming: no intermediate filtered list
+        total = sum(1 for a in source if _match(a))
+        paginated = list(islice((a for a in source if _match(a)), start, end))
+
+    # Envelope is assembled from per-alert cached JSON: unchanged alerts
+    # are never re-validated nor re-encoded
+    content = b'{"alerts":[%b],"total":%d,"page":%d,"limit":%d}' % (
+        b",".join(_encode_alert(a) for a in paginated),
+        total,
+        page,
+        limit,
     )
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/stats", response_model=AlertStatsResponse)
 async def get_alert_stats():
     """Recupere les statistiques des alertes."""
-    active = len([a for a in mock_alerts if a.status not in ["resolved", "dismissed"]])
-    critical = len([a for a in mock_alerts if a.severity == "critical" and a.status not in ["resolved", "dismissed"]])
-    investigating = len([a for a in mock_alerts if a.status == "investigating"])
-
-    today = datetime.now().date()
-    resolved_today = len([
-        a for a in mock_alerts
-        if a.resolved_at and datetime.fromisoformat(a.resolved_at.replace("Z", "+00:00")).date() == today
-    ])
-    new_today = len([
-        a for a in mock_alerts
-        if datetime.fromisoformat(a.created_at.replace("Z", "+00:00")).date() == today
-    ])
-    acknowledged = len([a for a in mock_alerts if a.status == "acknowledged"])
-    dismissed = len([a for a in mock_alerts if a.status == "dismissed"])
+    resolved_today, new_today = _today_counts()
 
     return AlertStatsResponse(
-        active=active,
-        critical=critical,
-        investigating=investigating,
+        active=_alert_counters["active"],
+        critical=_alert_counters["critical"],
+        investigating=_alert_counters.get("investigating", 0),
         resolved_today=resolved_today,
         new_today=new_today,
-        acknowledged=acknowledged,
-        dismissed=dismissed,
+        acknowledged=_alert_counters.get("acknowledged", 0),
+        dismissed=_alert_counters.get("dismissed", 0),
         average_resolution_time=3600,  # 1 hour in seconds
     )
 
@@ -372,7 +508,7 @@ async def get_alert_rules():
 @router.get("/{alert_id}", response_model=Alert)
 async def get_alert(alert_id: str):
     """Recupere une alerte par son ID."""
-    alert = next((a for a in mock_alerts if a.id == alert_id or a.alert_id == alert_id), None)
+    alert = _find_alert(alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
     return alert
@@ -381,39 +517,32 @@ async def get_alert(alert_id: str):
 @router.post("/{alert_id}/action", response_model=Alert)
 async def update_alert_status(alert_id: str, request: AlertActionRequest):
     """Met a jour le statut d'une alerte avec une action."""
-    alert = next((a for a in mock_alerts if a.id == alert_id or a.alert_id == alert_id), None)
+    alert = _find_alert(alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
-    now = datetime.now().isoformat()
+    now = datetime.now()
 
     # Create action
     action = AlertAction(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4().hex,
         action_type=request.action,
         description=request.comment or f"Action: {request.action}",
         performed_by="Current User",
         performed_at=now,
     )
-    alert.actions_taken.append(action)
-    alert.updated_at = now
+    _record_action(alert, action)
+    _touch(alert, now)
 
     # Update status based on action
-    status_map = {
-        "acknowledge": "acknowledged",
-        "investigate": "investigating",
-        "resolve": "resolved",
-        "dismiss": "dismissed",
-    }
-
-    if request.action in status_map:
-        alert.status = status_map[request.action]
+    if (new_status := _STATUS_MAP.get(request.action)) is not None:
+        _set_status(alert, new_status)
 
     if request.action == "acknowledge":
         alert.acknowledged_at = now
         alert.acknowledged_by = "Current User"
     elif request.action in ["resolve", "dismiss"]:
-        alert.resolved_at = now
+        _mark_resolved(alert, now)
         alert.resolved_by = "Current User"
 
     return alert
@@ -422,19 +551,20 @@ async def update_alert_status(alert_id: str, request: AlertActionRequest):
 @router.post("/{alert_id}/comments", response_model=Alert)
 async def add_alert_comment(alert_id: str, request: AlertCommentRequest):
     """Ajoute un commentaire a une alerte."""
-    alert = next((a for a in mock_alerts if a.id == alert_id or a.alert_id == alert_id), None)
+    alert = _find_alert(alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
+    now = datetime.now()
     action = AlertAction(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4().hex,
         action_type="comment",
         description=request.comment,
         performed_by="Current User",
-        performed_at=datetime.now().isoformat(),
+        performed_at=now,
     )
-    alert.actions_taken.append(action)
-    alert.updated_at = datetime.now().isoformat()
+    _record_action(alert, action)
+    _touch(alert, now)
 
     return alert
 
@@ -446,21 +576,22 @@ async def create_investigation_from_alert(request: CreateInvestigationRequest):
 
     Cree une investigation a partir d'une alerte.
     """
-    alert = next((a for a in mock_alerts if a.id == request.alert_id or a.alert_id == request.alert_id), None)
+    alert = _find_alert(request.alert_id)
     if not alert:
         raise HTTPException(status_code=404, detail="Alert not found")
 
     # Update alert status
-    alert.status = "investigating"
-    alert.updated_at = datetime.now().isoformat()
+    now = datetime.now()
+    _set_status(alert, "investigating")
+    _touch(alert, now)
 
     # Create investigation
-    inv_id = f"INV-{datetime.now().strftime('%Y')}-{str(uuid.uuid4())[:8].upper()}"
+    inv_id = f"INV-{now.year}-{secrets.token_hex(4).upper()}"
 
     return InvestigationResponse(
-        id=str(uuid.uuid4()),
+        id=uuid.uuid4().hex,
         investigation_id=inv_id,
         title=f"Investigation depuis {alert.alert_id}: {alert.title}",
         status="open",
-        created_at=datetime.now().isoformat(),
+        created_at=now.isoformat(),
     )
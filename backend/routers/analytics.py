@@ -3,39 +3,144 @@ FraudShield AI - Analytics Router
 API endpoints for fraud analytics and reporting
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, Depends
+from fastapi.responses import Response, StreamingResponse
 from typing import Optional
 from datetime import datetime, timedelta
 import random
+import numpy as np
+import orjson
 
+from ..dependencies import get_fraud_service
 from ..services.fraud_service import FraudService
+from ..utils.cache import ttl_cache
+from ..utils._stats import AMOUNT, FLAGGED, FLAGGED_AMOUNT, TRANSACTIONS, gen_buckets
 
 router = APIRouter()
 
+# Read-only analytics payloads only depend on their query parameters:
+# repeated polls within this window are served from memory
+ANALYTICS_CACHE_TTL_SECONDS = 60
+
+_rng = np.random.default_rng()
+
+
+# =============================================================================
+# STATIC TABLES
+# =============================================================================
+
+# Reference data is constant: derived fields are computed once at import
+_FRAUD_TYPES = [
+    {"type": "surfacturation", "count": 145, "amount": 234500},
+    {"type": "prestations_fictives", "count": 98, "amount": 187200},
+    {"type": "usurpation_identite", "count": 87, "amount": 156800},
+    {"type": "falsification_documents", "count": 76, "amount": 98700},
+    {"type": "collusion", "count": 54, "amount": 234100},
+    {"type": "fraude_cotisations", "count": 49, "amount": 312400},
+]
+_FRAUD_TYPE_TOTAL = sum(ft["count"] for ft in _FRAUD_TYPES)
+_FRAUD_TYPE_DISTRIBUTION = [
+    {
+        "type": ft["type"],
+        "count": ft["count"],
+        "percentage": round(ft["count"] / _FRAUD_TYPE_TOTAL * 100, 1),
+        "amount": ft["amount"]
+    }
+    for ft in _FRAUD_TYPES
+]
+# Constant part of the /fraud-types body, without its opening brace
+_FRAUD_TYPE_BODY = orjson.dumps({
+    "distribution": _FRAUD_TYPE_DISTRIBUTION,
+    "total": _FRAUD_TYPE_TOTAL
+})[1:]
+
+_PROVIDERS = [
+    {"id": "PRO-001", "name": "Cabinet Medical Alpha", "risk": 0.89, "txn": 245, "flagged": 42, "amount": 156000},
+    {"id": "PRO-002", "name": "Clinique Beta", "risk": 0.76, "txn": 189, "flagged": 28, "amount": 234000},
+    {"id": "PRO-003", "name": "Laboratoire Gamma", "risk": 0.72, "txn": 312, "flagged": 38, "amount": 89000},
+    {"id": "PRO-004", "name": "Centre Dentaire Delta", "risk": 0.68, "txn": 156, "flagged": 18, "amount": 178000},
+    {"id": "PRO-005", "name": "Pharmacie Epsilon", "risk": 0.65, "txn": 423, "flagged": 45, "amount": 67000},
+    {"id": "PRO-006", "name": "Hopital Zeta", "risk": 0.58, "txn": 567, "flagged": 52, "amount": 456000},
+    {"id": "PRO-007", "name": "Cabinet Optique Eta", "risk": 0.54, "txn": 234, "flagged": 19, "amount": 123000},
+    {"id": "PRO-008", "name": "Centre Kine Theta", "risk": 0.48, "txn": 178, "flagged": 12, "amount": 89000},
+    {"id": "PRO-009", "name": "Clinique Iota", "risk": 0.45, "txn": 298, "flagged": 15, "amount": 187000},
+    {"id": "PRO-010", "name": "Laboratoire Kappa", "risk": 0.42, "txn": 456, "flagged": 21, "amount": 134000},
+]
+_PROVIDER_RANKING = [
+    {
+        "provider_id": p["id"],
+        "provider_name": p["name"],
+        "risk_score": p["risk"],
+        "total_transactions": p["txn"],
+        "flagged_transactions": p["flagged"],
+        "total_amount": p["amount"],
+        "fraud_rate": round(p["flagged"] / p["txn"] * 100, 1)
+    }
+    for p in _PROVIDERS
+]
+
+_BENEFICIARIES = [
+    {"id": "BEN-001", "name": "Jean Dupont", "risk": 0.92, "txn": 34, "flagged": 12, "amount": 45000},
+    {"id": "BEN-002", "name": "Marie Martin", "risk": 0.85, "txn": 28, "flagged": 9, "amount": 38000},
+    {"id": "BEN-003", "name": "Pierre Bernard", "risk": 0.78, "txn": 42, "flagged": 11, "amount": 52000},
+    {"id": "BEN-004", "name": "Sophie Leroy", "risk": 0.71, "txn": 19, "flagged": 4, "amount": 23000},
+    {"id": "BEN-005", "name": "Luc Moreau", "risk": 0.68, "txn": 56, "flagged": 10, "amount": 67000},
+    {"id": "BEN-006", "name": "Claire Simon", "risk": 0.62, "txn": 31, "flagged": 5, "amount": 34000},
+    {"id": "BEN-007", "name": "Antoine Laurent", "risk": 0.55, "txn": 45, "flagged": 6, "amount": 48000},
+    {"id": "BEN-008", "name": "Emma Petit", "risk": 0.49, "txn": 23, "flagged": 2, "amount": 19000},
+    {"id": "BEN-009", "name": "Thomas Roux", "risk": 0.45, "txn": 67, "flagged": 4, "amount": 72000},
+    {"id": "BEN-010", "name": "Julie Fournier", "risk": 0.41, "txn": 38, "flagged": 2, "amount": 41000},
+]
+_BENEFICIARY_RANKING = [
+    {
+        "beneficiary_id": b["id"],
+        "beneficiary_name": b["name"],
+        "risk_score": b["risk"],
+        "total_transactions": b["txn"],
+        "flagged_transactions": b["flagged"],
+        "total_amount": b["amount"],
+        "fraud_rate": round(b["flagged"] / b["txn"] * 100, 1)
+    }
+    for b in _BENEFICIARIES
+]
+
+
+_PERIOD_DAYS = {
+    "7d": 7,
+    "30d": 30,
+    "90d": 90,
+    "365d": 365
+}
 
-def get_fraud_service() -> FraudService:
-    """Dependency injection for fraud service."""
-    from ..main import fraud_service
-    if fraud_service is None:
-        raise HTTPException(status_code=503, detail="Service not initialized")
-    return fraud_service
+# Dashboard trend series: (name, base value, variance)
+_TREND_SERIES = (
+    ("fraud_rate_trend", 2.5, 0.3),
+    ("volume_trend", 450, 0.15),
+    ("amount_trend", 380000, 0.2),
+)
 
 
 def generate_trend_data(days: int, base_value: float, variance: float = 0.2):
     """Generate realistic trend data."""
-    data = []
-    current_date = datetime.now() - timedelta(days=days)
-    for i in range(days):
-        date = current_date + timedelta(days=i)
-        value = base_value * (1 + random.uniform(-variance, variance))
-        data.append({
-            "date": date.strftime("%Y-%m-%d"),
-            "value": round(value, 2)
-        })
-    return data
+    # One vectorized draw and date range instead of a per-day Python loop
+    values = base_value * (1 + _rng.uniform(-variance, variance, days))
+    dates = np.datetime64(datetime.now().date(), "D") - days + np.arange(days)
+    return [
+        {"date": date, "value": value}
+        for date, value in zip(dates.astype(str).tolist(), np.round(values, 2).tolist())
+    ]
+
+
+def _iter_trend_lines(trends: dict):
+    """Yield trend points as NDJSON lines, one series at a time."""
+    # Points belong to a cached dashboard payload: never mutate them
+    for series, points in trends.items():
+        for point in points:
+            yield orjson.dumps({"series": series, **point}) + b"\n"
 
 
 @router.get("/dashboard")
+@ttl_cache(ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS)
 async def get_dashboard_data(
     period: str = "30d",
     service: FraudService = Depends(get_fraud_service)
@@ -45,12 +150,7 @@ async def get_dashboard_data(
 
     Periodes: 7d, 30d, 90d, 365d
     """
-    period_days = {
-        "7d": 7,
-        "30d": 30,
-        "90d": 90,
-        "365d": 365
-    }.get(period, 30)
+    period_days = _PERIOD_DAYS.get(period, 30)
 
     # Generate realistic mock data based on period
     base_transactions = period_days * 450
@@ -86,14 +186,32 @@ async def get_dashboard_data(
             "false_positive_rate": round(false_positives / max(flagged_transactions, 1) * 100, 2)
         },
         "trends": {
-            "fraud_rate_trend": generate_trend_data(period_days, 2.5, 0.3),
-            "volume_trend": generate_trend_data(period_days, 450, 0.15),
-            "amount_trend": generate_trend_data(period_days, 380000, 0.2)
+            series: generate_trend_data(period_days, base_value, variance)
+            for series, base_value, variance in _TREND_SERIES
         },
-        "generated_at": datetime.now().isoformat()
+        "generated_at": datetime.now()
     }
 
 
+@router.get("/dashboard/trends")
+async def get_dashboard_trends(
+    period: str = "30d",
+    service: FraudService = Depends(get_fraud_service)
+):
+    """
+    Recuperer les tendances du tableau de bord en NDJSON.
+
+    Une ligne par point: {"series", "date", "value"}. Les points sont ceux
+    du bloc trends de /dashboard pour la meme periode (meme cache), emis au
+    fil de l'eau au lieu d'un seul document JSON.
+    """
+    dashboard = await get_dashboard_data(period=period, service=service)
+    return StreamingResponse(
+        _iter_trend_lines(dashboard["trends"]),
+        media_type="application/x-ndjson"
+    )
+
+
 @router.get("/statistics")
 async def get_fraud_statistics(
     start_date: Optional[str] = None,
@@ -116,43 +234,40 @@ async def get_fraud_statistics(
     end = datetime.strptime(end_date, "%Y-%m-%d")
 
     # Generate statistics based on grouping
-    statistics = []
-    current = start
-
     if group_by == "day":
-        delta = timedelta(days=1)
+        step_days = 1
     elif group_by == "week":
-        delta = timedelta(weeks=1)
+        step_days = 7
     else:  # month
-        delta = timedelta(days=30)
-
-    total_transactions = 0
-    total_flagged = 0
-    total_amount = 0.0
-    flagged_amount = 0.0
-
-    while current <= end:
-        transactions = random.randint(1100, 1700)
-        flagged = int(transactions * random.uniform(0.015, 0.035))
-        confirmed = int(flagged * random.uniform(0.65, 0.80))
-        amount = transactions * random.uniform(750, 950)
-        f_amount = flagged * random.uniform(2000, 3500)
-
-        statistics.append({
-            "date": current.strftime("%d/%m"),
+        step_days = 30
+
+    dates = np.arange(
+        np.datetime64(start.date(), "D"),
+        np.datetime64(end.date(), "D") + 1,
+        step_days
+    ).astype(str).tolist()
+    buckets = gen_buckets(len(dates), int(_rng.integers(2**31)))
+    counts = buckets[:, :AMOUNT].astype(np.int64).tolist()
+    amounts = np.round(buckets[:, AMOUNT:], 2).tolist()
+
+    statistics = [
+        {
+            "date": f"{date[8:10]}/{date[5:7]}",
             "transactions": transactions,
             "flagged": flagged,
             "confirmed_fraud": confirmed,
-            "amount": round(amount, 2),
-            "flagged_amount": round(f_amount, 2)
-        })
-
-        total_transactions += transactions
-        total_flagged += flagged
-        total_amount += amount
-        flagged_amount += f_amount
+            "amount": amount,
+            "flagged_amount": f_amount
+        }
+        for date, (transactions, flagged, confirmed), (amount, f_amount)
+        in zip(dates, counts, amounts)
+    ]
 
-        current += delta
+    totals = buckets.sum(axis=0)
+    total_transactions = int(totals[TRANSACTIONS])
+    total_flagged = int(totals[FLAGGED])
+    total_amount = float(totals[AMOUNT])
+    flagged_amount = float(totals[FLAGGED_AMOUNT])
 
     return {
         "period": {
@@ -178,32 +293,11 @@ async def get_fraud_type_distribution(
     """
     Recuperer la distribution des types de fraude.
     """
-    # Realistic fraud type distribution
-    fraud_types = [
-        {"type": "surfacturation", "count": 145, "amount": 234500},
-        {"type": "prestations_fictives", "count": 98, "amount": 187200},
-        {"type": "usurpation_identite", "count": 87, "amount": 156800},
-        {"type": "falsification_documents", "count": 76, "amount": 98700},
-        {"type": "collusion", "count": 54, "amount": 234100},
-        {"type": "fraude_cotisations", "count": 49, "amount": 312400},
-    ]
-
-    total = sum(ft["count"] for ft in fraud_types)
-
-    distribution = []
-    for ft in fraud_types:
-        distribution.append({
-            "type": ft["type"],
-            "count": ft["count"],
-            "percentage": round(ft["count"] / total * 100, 1),
-            "amount": ft["amount"]
-        })
-
-    return {
-        "period": period,
-        "distribution": distribution,
-        "total": total
-    }
+    # Only the echoed period is encoded per request
+    return Response(
+        content=b'{"period":' + orjson.dumps(period) + b"," + _FRAUD_TYPE_BODY,
+        media_type="application/json"
+    )
 
 
 @router.get("/providers/risk")
@@ -214,33 +308,8 @@ async def get_provider_risk_ranking(
     """
     Recuperer le classement des prestataires par risque.
     """
-    providers = [
-        {"id": "PRO-001", "name": "Cabinet Medical Alpha", "risk": 0.89, "txn": 245, "flagged": 42, "amount": 156000},
-        {"id": "PRO-002", "name": "Clinique Beta", "risk": 0.76, "txn": 189, "flagged": 28, "amount": 234000},
-        {"id": "PRO-003", "name": "Laboratoire Gamma", "risk": 0.72, "txn": 312, "flagged": 38, "amount": 89000},
-        {"id": "PRO-004", "name": "Centre Dentaire Delta", "risk": 0.68, "txn": 156, "flagged": 18, "amount": 178000},
-        {"id": "PRO-005", "name": "Pharmacie Epsilon", "risk": 0.65, "txn": 423, "flagged": 45, "amount": 67000},
-        {"id": "PRO-006", "name": "Hopital Zeta", "risk": 0.58, "txn": 567, "flagged": 52, "amount": 456000},
-        {"id": "PRO-007", "name": "Cabinet Optique Eta", "risk": 0.54, "txn": 234, "flagged": 19, "amount": 123000},
-        {"id": "PRO-008", "name": "Centre Kine Theta", "risk": 0.48, "txn": 178, "flagged": 12, "amount": 89000},
-        {"id": "PRO-009", "name": "Clinique Iota", "risk": 0.45, "txn": 298, "flagged": 15, "amount": 187000},
-        {"id": "PRO-010", "name": "Laboratoire Kappa", "risk": 0.42, "txn": 456, "flagged": 21, "amount": 134000},
-    ]
-
-    ranking = []
-    for p in providers[:limit]:
-        ranking.append({
-            "provider_id": p["id"],
-            "provider_name": p["name"],
-            "risk_score": p["risk"],
-            "total_transactions": p["txn"],
-            "flagged_transactions": p["flagged"],
-            "total_amount": p["amount"],
-            "fraud_rate": round(p["flagged"] / p["txn"] * 100, 1)
-        })
-
     return {
-        "ranking": ranking,
+        "ranking": _PROVIDER_RANKING[:limit],
         "limit": limit
     }
 
@@ -253,38 +322,14 @@ async def get_beneficiary_risk_ranking(
     """
     Recuperer le classement des beneficiaires par risque.
     """
-    beneficiaries = [
-        {"id": "BEN-001", "name": "Jean Dupont", "risk": 0.92, "txn": 34, "flagged": 12, "amount": 45000},
-        {"id": "BEN-002", "name": "Marie Martin", "risk": 0.85, "txn": 28, "flagged": 9, "amount": 38000},
-        {"id": "BEN-003", "name": "Pierre Bernard", "risk": 0.78, "txn": 42, "flagged": 11, "amount": 52000},
-        {"id": "BEN-004", "name": "Sophie Leroy", "risk": 0.71, "txn": 19, "flagged": 4, "amount": 23000},
-        {"id": "BEN-005", "name": "Luc Moreau", "risk": 0.68, "txn": 56, "flagged": 10, "amount": 67000},
-        {"id": "BEN-006", "name": "Claire Simon", "risk": 0.62, "txn": 31, "flagged": 5, "amount": 34000},
-        {"id": "BEN-007", "name": "Antoine Laurent", "risk": 0.55, "txn": 45, "flagged": 6, "amount": 48000},
-        {"id": "BEN-008", "name": "Emma Petit", "risk": 0.49, "txn": 23, "flagged": 2, "amount": 19000},
-        {"id": "BEN-009", "name": "Thomas Roux", "risk": 0.45, "txn": 67, "flagged": 4, "amount": 72000},
-        {"id": "BEN-010", "name": "Julie Fournier", "risk": 0.41, "txn": 38, "flagged": 2, "amount": 41000},
-    ]
-
-    ranking = []
-    for b in beneficiaries[:limit]:
-        ranking.append({
-            "beneficiary_id": b["id"],
-            "beneficiary_name": b["name"],
-            "risk_score": b["risk"],
-            "total_transactions": b["txn"],
-            "flagged_transactions": b["flagged"],
-            "total_amount": b["amount"],
-            "fraud_rate": round(b["flagged"] / b["txn"] * 100, 1)
-        })
-
     return {
-        "ranking": ranking,
+        "ranking": _BENEFICIARY_RANKING[:limit],
         "limit": limit
     }
 
 
 @router.get("/model/performance")
+@ttl_cache(ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS)
 async def get_model_performance(
     period: str = "30d",
     service: FraudService = Depends(get_fraud_service)
@@ -295,10 +340,7 @@ async def get_model_performance(
     model_info = service.get_model_info()
 
     # Realistic performance metrics
-    tp = random.randint(420, 490)
-    tn = random.randint(8000, 8500)
-    fp = random.randint(55, 80)
-    fn = random.randint(18, 30)
+    tp, tn, fp, fn = _rng.integers([420, 8000, 55, 18], [491, 8501, 81, 31]).tolist()
 
     precision = tp / (tp + fp)
     recall = tp / (tp + fn)
@@ -319,7 +361,7 @@ async def get_model_performance(
             "precision": round(precision, 3),
             "recall": round(recall, 3),
             "f1_score": round(f1, 3),
-            "auc_roc": round(random.uniform(0.90, 0.94), 3)
+            "auc_roc": round(float(_rng.uniform(0.90, 0.94)), 3)
         },
         "cost_analysis": {
             "true_positives": tp,
@@ -339,16 +381,18 @@ async def get_model_performance(
 
 
 @router.get("/model/training")
+@ttl_cache(ttl_seconds=ANALYTICS_CACHE_TTL_SECONDS)
 async def get_training_status(
     service: FraudService = Depends(get_fraud_service)
 ):
     """
     Recuperer le statut d'entrainement du modele RL.
     """
+    now = datetime.now()
     return {
         "status": "idle",
-        "last_trained": (datetime.now() - timedelta(days=2)).isoformat(),
-        "next_scheduled": (datetime.now() + timedelta(days=5)).isoformat(),
+        "last_trained": now - timedelta(days=2),
+        "next_scheduled": now + timedelta(days=5),
         "experience_buffer_size": random.randint(14000, 16000),
         "current_epoch": None,
         "total_epochs": None,
@@ -371,7 +415,8 @@ async def export_report(
     Formats: pdf, csv, xlsx
     """
     # In production, this would generate the actual report
-    report_id = f"RPT-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    now = datetime.now()
+    report_id = f"RPT-{now:%Y%m%d%H%M%S}"
 
     return {
         "report_id": report_id,
@@ -383,6 +428,6 @@ async def export_report(
         "format": format,
         "status": "generating",
         "download_url": None,
-        "estimated_completion": (datetime.now() + timedelta(seconds=30)).isoformat(),
+        "estimated_completion": now + timedelta(seconds=30),
         "message": f"Rapport {report_type} en cours de generation. ID: {report_id}"
     }
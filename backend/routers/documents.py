@@ -4,22 +4,25 @@ API endpoints for document analysis
 """
 
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Optional
 from datetime import datetime
 
 from ..models.requests import DocumentAnalysisRequest, Document
 from ..models.responses import DocumentAnalysisResponse
+from ..dependencies import get_fraud_service
 from ..services.fraud_service import FraudService
 
 router = APIRouter()
 
 
-def get_fraud_service() -> FraudService:
-    """Dependency injection for fraud service."""
-    from ..main import fraud_service
-    if fraud_service is None:
-        raise HTTPException(status_code=503, detail="Service not initialized")
-    return fraud_service
+# Larger batches are converted off the event loop
+_INLINE_DUMP_MAX_DOCUMENTS = 32
+
+
+def _dump_documents(documents: List[Document]) -> List[dict]:
+    """Convertit les documents valides en dicts pour l'agent d'analyse."""
+    return [doc.model_dump() for doc in documents]
 
 
 @router.post("/analyze", response_model=DocumentAnalysisResponse)
@@ -37,7 +40,10 @@ async def analyze_documents(
     - **classification**: Classification du type de document
     """
     try:
-        documents = [doc.dict() for doc in request.documents]
+        if len(request.documents) > _INLINE_DUMP_MAX_DOCUMENTS:
+            documents = await run_in_threadpool(_dump_documents, request.documents)
+        else:
+            documents = _dump_documents(request.documents)
 
         result = await service.analyze_documents(
             documents=documents,
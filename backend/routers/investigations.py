@@ -5,13 +5,20 @@ API endpoints for fraud investigations
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterator, Tuple
 from datetime import datetime, timedelta
+from itertools import islice
+from types import MappingProxyType
+import os
+import time
 import uuid
+import numpy as np
 
 from ..models.requests import InvestigationRequest, NetworkAnalysisRequest
 from ..models.responses import InvestigationReportResponse, NetworkAnalysisResponse, InvestigationListResponse, InvestigationStartResponse
-from ..services.fraud_service import FraudService
+from ..dependencies import get_fraud_service
+from ..services.fraud_service import FraudService, MAX_NETWORK_DEPTH
+from ..utils.clock import now_iso
 
 router = APIRouter()
 
@@ -32,19 +39,11 @@ class CreateFromAlertRequest(BaseModel):
     reason: Optional[str] = Field(default=None, description="Raison de l'investigation")
 
 
-def get_fraud_service() -> FraudService:
-    """Dependency injection for fraud service."""
-    from ..main import fraud_service
-    if fraud_service is None:
-        raise HTTPException(status_code=503, detail="Service not initialized")
-    return fraud_service
-
-
 # =============================================================================
 # MOCK DATA STORE
 # =============================================================================
 
-mock_investigations: List[Dict[str, Any]] = [
+_SEED_INVESTIGATIONS: List[Dict[str, Any]] = [
     {
         "investigation_id": "INV-2025-001",
         "transaction_id": "TX-2025-0891",
@@ -89,6 +88,149 @@ mock_investigations: List[Dict[str, Any]] = [
 ]
 
 
+class InvestigationStore:
+    """
+    Columnar in-memory investigation store.
+
+    Filtered fields (status, priority) are dictionary-encoded into
+    contiguous numpy int columns (any string value, no truncation) so list
+    queries are vectorized compares; full records are only materialized for
+    the requested page.
+
+    The store keeps at most max_size investigations: the oldest ones are
+    evicted first. Evicted rows are skipped through an offset and only
+    physically removed in batches, so eviction is amortized O(1).
+    """
+
+    def __init__(
+        self,
+        records: List[Dict[str, Any]],
+        max_size: int = 10_000,
+        capacity: int = 64
+    ):
+        self._records: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        # Value -> code, shared by the status and priority columns
+        self._codes: Dict[str, int] = {}
+        self._status = np.empty(capacity, dtype=np.int32)
+        self._priority = np.empty(capacity, dtype=np.int32)
+        self._offset = 0
+        self._max_size = max_size
+        self._compact_threshold = max(1, max_size // 10)
+        for record in records:
+            self.append(record)
+
+    def __len__(self) -> int:
+        return len(self._records) - self._offset
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return islice(self._records, self._offset, None)
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Ajoute une investigation, en evincant la plus ancienne si le store est plein."""
+        i = len(self._records)
+        if i == len(self._status):
+            new_capacity = max(2 * i, 16)
+            self._status = np.resize(self._status, new_capacity)
+            self._priority = np.resize(self._priority, new_capacity)
+        self._status[i] = self._encode(record.get("status") or "")
+        self._priority[i] = self._encode(record.get("priority") or "")
+        self._records.append(record)
+        self._by_id[record["investigation_id"]] = record
+
+        if len(self) > self._max_size:
+            evicted = self._records[self._offset]
+            if self._by_id.get(evicted["investigation_id"]) is evicted:
+                del self._by_id[evicted["investigation_id"]]
+            self._offset += 1
+            if self._offset >= self._compact_threshold:
+                self._compact()
+
+    def _encode(self, value: str) -> int:
+        """Retourne le code d'une valeur, en l'ajoutant au dictionnaire si besoin."""
+        return self._codes.setdefault(value, len(self._codes))
+
+    def get(self, investigation_id: str) -> Optional[Dict[str, Any]]:
+        """Retourne une investigation par son ID (O(1))."""
+        return self._by_id.get(investigation_id)
+
+    def _compact(self) -> None:
+        """Supprime physiquement les lignes evincees."""
+        n = len(self._records)
+        offset = self._offset
+        del self._records[:offset]
+        self._status[:n - offset] = self._status[offset:n]
+        self._priority[:n - offset] = self._priority[offset:n]
+        self._offset = 0
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        priority: Optional[str] = None,
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Filtre et pagine les investigations.
+
+        Returns:
+            (total des resultats filtres, investigations de la page)
+        """
+        offset = self._offset
+        n = len(self._records)
+        mask = None
+        if status:
+            code = self._codes.get(status)
+            if code is None:
+                return 0, []
+            mask = self._status[offset:n] == code
+        if priority:
+            code = self._codes.get(priority)
+            if code is None:
+                return 0, []
+            by_priority = self._priority[offset:n] == code
+            mask = by_priority if mask is None else mask & by_priority
+
+        if mask is None:
+            stop = None if end is None else offset + end
+            return n - offset, self._records[offset + start:stop]
+
+        matches = np.flatnonzero(mask)
+        return len(matches), [self._records[offset + i] for i in matches[start:end].tolist()]
+
+
+mock_investigations = InvestigationStore(_SEED_INVESTIGATIONS)
+
+
+# =============================================================================
+# STUB RESPONSE TEMPLATES
+# =============================================================================
+
+# Constant parts of the stub responses (read-only, merged into each response)
+_NOT_FOUND_TEMPLATE = MappingProxyType({
+    "transaction_id": None,
+    "status": "not_found",
+    "findings": (),
+    "timeline": (),
+    "note": "Investigation lookup requires database integration",
+})
+
+_TIMELINE_TEMPLATE = MappingProxyType({
+    "timeline": (),
+    "note": "Timeline requires database integration",
+})
+
+# Path lookups expand bidirectionally: beyond this many hops the traversal
+# cost explodes
+MAX_PATH_HOPS = 6
+
+_PATH_TEMPLATE = MappingProxyType({
+    "path_found": False,
+    "path": (),
+    "note": "Path finding requires Neo4j integration",
+})
+
+
 # =============================================================================
 # LIST INVESTIGATIONS
 # =============================================================================
@@ -104,17 +246,8 @@ async def list_investigations(
     """
     Liste les investigations avec pagination et filtres.
     """
-    filtered = mock_investigations.copy()
-
-    if status:
-        filtered = [inv for inv in filtered if inv.get("status") == status]
-    if priority:
-        filtered = [inv for inv in filtered if inv.get("priority") == priority]
-
-    total = len(filtered)
     start = (page - 1) * limit
-    end = start + limit
-    paginated = filtered[start:end]
+    total, paginated = mock_investigations.query(status, priority, start, start + limit)
 
     return InvestigationListResponse(
         investigations=paginated,
@@ -138,7 +271,8 @@ async def start_investigation(
 
     Cree un nouveau dossier d'investigation lie a la transaction specifiee.
     """
-    investigation_id = f"INV-{datetime.now().strftime('%Y%m%d%H%M%S')}-{uuid.uuid4().hex[:4].upper()}"
+    timestamp = now_iso()
+    investigation_id = "INV-" + uuid.uuid4().hex[:16]
 
     # Ajouter au mock store
     new_investigation = {
@@ -151,15 +285,15 @@ async def start_investigation(
         "reason": request.reason,
         "findings": [],
         "risk_score": 0.0,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": timestamp,
+        "updated_at": timestamp,
     }
     mock_investigations.append(new_investigation)
 
     return InvestigationStartResponse(
         investigation_id=investigation_id,
         status="open",
-        created_at=datetime.now().isoformat(),
+        created_at=timestamp,
         transaction_id=request.transaction_id,
         reason=request.reason
     )
@@ -179,7 +313,8 @@ async def create_investigation_from_alert(
 
     Lie automatiquement l'investigation a l'alerte source.
     """
-    investigation_id = f"INV-{datetime.now().strftime('%Y')}-{uuid.uuid4().hex[:8].upper()}"
+    timestamp = now_iso()
+    investigation_id = "INV-" + uuid.uuid4().hex[:16]
 
     # Ajouter au mock store
     new_investigation = {
@@ -192,15 +327,15 @@ async def create_investigation_from_alert(
         "reason": request.reason or f"Investigation depuis alerte {request.alert_id}",
         "findings": [],
         "risk_score": 0.0,
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
+        "created_at": timestamp,
+        "updated_at": timestamp,
     }
     mock_investigations.append(new_investigation)
 
     return InvestigationStartResponse(
         investigation_id=investigation_id,
         status="open",
-        created_at=datetime.now().isoformat(),
+        created_at=timestamp,
         reason=request.reason
     )
 
@@ -247,7 +382,7 @@ async def create_investigation(
             report_text=result.get("report_text", ""),
             sections=result.get("sections", {}),
             page_count_estimate=result.get("page_count_estimate", 1),
-            generated_at=datetime.now().isoformat()
+            generated_at=now_iso()
         )
 
     except Exception as e:
@@ -272,7 +407,7 @@ async def analyze_network(
         result = await service.analyze_network(
             entity_id=request.entity_id,
             entity_type=request.entity_type,
-            depth=request.depth
+            depth=min(request.depth, MAX_NETWORK_DEPTH)
         )
 
         return NetworkAnalysisResponse(
@@ -300,10 +435,7 @@ async def get_investigation(
     Recuperer les details d'une investigation par son ID.
     """
     # Chercher dans le mock store
-    investigation = next(
-        (inv for inv in mock_investigations if inv.get("investigation_id") == investigation_id),
-        None
-    )
+    investigation = mock_investigations.get(investigation_id)
 
     if investigation:
         return {
@@ -325,15 +457,12 @@ async def get_investigation(
         }
 
     # Si non trouve, retourner structure vide
+    timestamp = now_iso()
     return {
         "investigation_id": investigation_id,
-        "transaction_id": None,
-        "status": "not_found",
-        "findings": [],
-        "timeline": [],
-        "created_at": datetime.now().isoformat(),
-        "updated_at": datetime.now().isoformat(),
-        "note": "Investigation lookup requires database integration"
+        **_NOT_FOUND_TEMPLATE,
+        "created_at": timestamp,
+        "updated_at": timestamp,
     }
 
 
@@ -345,11 +474,7 @@ async def get_investigation_timeline(
     """
     Récupérer la chronologie d'une investigation.
     """
-    return {
-        "case_id": case_id,
-        "timeline": [],
-        "note": "Timeline requires database integration"
-    }
+    return {"case_id": case_id, **_TIMELINE_TEMPLATE}
 
 
 @router.post("/{case_id}/evidence")
@@ -365,11 +490,11 @@ async def add_evidence(
     """
     return {
         "case_id": case_id,
-        "evidence_id": f"EVD-{datetime.now().strftime('%Y%m%d%H%M%S')}",
+        "evidence_id": f"EVD-{int(time.time())}-{os.urandom(2).hex()}",
         "evidence_type": evidence_type,
         "description": description,
         "document_id": document_id,
-        "added_at": datetime.now().isoformat()
+        "added_at": now_iso()
     }
 
 
@@ -393,7 +518,7 @@ async def resolve_investigation(
         "confirmed_fraud": confirmed_fraud,
         "notes": notes,
         "investigator_id": investigator_id,
-        "resolved_at": datetime.now().isoformat(),
+        "resolved_at": now_iso(),
         "feedback_recorded": True
     }
 
@@ -406,14 +531,19 @@ async def scan_fraud_rings(
     """
     Scanner le réseau pour détecter les cercles de fraude.
     """
-    # In production, would run network scan
+    try:
+        scan = await service.scan_fraud_rings(min_size=min_size)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    # Keep the endpoint's response schema independent of the analyzer payload
+    rings = scan.get("prioritized_rings", [])
     return {
-        "scan_type": "full_network",
+        "scan_type": scan.get("scan_type", "full_network"),
         "min_ring_size": min_size,
-        "rings_detected": 0,
-        "rings": [],
-        "scan_timestamp": datetime.now().isoformat(),
-        "note": "Full scan requires Neo4j integration"
+        "rings_detected": len(rings),
+        "rings": rings,
+        "scan_timestamp": scan.get("scan_timestamp") or now_iso(),
     }
 
 
@@ -426,12 +556,21 @@ async def find_entity_path(
 ):
     """
     Trouver le chemin entre deux entités dans le réseau.
+
+    Le nombre de sauts est plafonné a MAX_PATH_HOPS.
     """
+    if not 1 <= max_hops <= MAX_PATH_HOPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"max_hops doit etre compris entre 1 et {MAX_PATH_HOPS}"
+        )
+
+    # Once wired to Neo4j, resolve with an unweighted BFS
+    # (gds.shortestPath.bfs) bounded by max_hops rather than Cypher
+    # shortestPath()/Dijkstra
     return {
         "source": source_entity_id,
         "target": target_entity_id,
         "max_hops": max_hops,
-        "path_found": False,
-        "path": [],
-        "note": "Path finding requires Neo4j integration"
+        **_PATH_TEMPLATE,
     }
@@ -3,11 +3,13 @@ FraudShield AI - Settings Router
 API endpoints for system configuration management
 """
 
-from fastapi import APIRouter, HTTPException, Request, UploadFile, File
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
 from typing import Optional, List
 from datetime import datetime
-import io
+import asyncio
+import orjson
 
 from ..models.settings import (
     AllSettings,
@@ -33,12 +35,28 @@ from ..services.settings_service import get_settings_service
 router = APIRouter(prefix="/api/v1/settings", tags=["settings"])
 
 
-def get_client_ip(request: Request) -> str:
-    """Extrait l'IP du client."""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+async def get_client_ip(request: Request) -> str:
+    """Extrait l'IP du client (dependance, calculee une fois par requete)."""
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is None:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            client_ip = forwarded.split(",", 1)[0].strip()
+        else:
+            client_ip = request.client.host if request.client else "unknown"
+        request.state.client_ip = client_ip
+    return client_ip
+
+
+async def render_settings(request: Request, section: Optional[str] = None) -> Response:
+    """
+    Renvoie les paramètres (ou une section) depuis le JSON mis en cache par
+    le service, ou une réponse 304 si le client a déjà la version courante.
+    """
+    etag, body = await get_settings_service().get_rendered(section)
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 
 # =============================================================================
@@ -46,7 +64,7 @@ def get_client_ip(request: Request) -> str:
 # =============================================================================
 
 @router.get("", response_model=AllSettings)
-async def get_all_settings():
+async def get_all_settings(request: Request):
     """
     Récupère tous les paramètres du système.
 
@@ -62,14 +80,13 @@ async def get_all_settings():
     - Politiques de rétention
     - Paramètres système
     """
-    service = get_settings_service()
-    return await service.get_all_settings()
+    return await render_settings(request)
 
 
 @router.put("", response_model=AllSettings)
 async def update_settings(
     update: SettingsUpdateRequest,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -94,7 +111,7 @@ async def update_settings(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
 
 
@@ -114,16 +131,15 @@ async def validate_settings(update: SettingsUpdateRequest):
 # =============================================================================
 
 @router.get("/risk-thresholds", response_model=RiskThresholds)
-async def get_risk_thresholds():
+async def get_risk_thresholds(request: Request):
     """Récupère les seuils de classification des risques."""
-    service = get_settings_service()
-    return await service.get_risk_thresholds()
+    return await render_settings(request, "risk_thresholds")
 
 
 @router.put("/risk-thresholds", response_model=RiskThresholds)
 async def update_risk_thresholds(
     thresholds: RiskThresholds,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -133,7 +149,7 @@ async def update_risk_thresholds(
         thresholds,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
 
 
@@ -142,16 +158,15 @@ async def update_risk_thresholds(
 # =============================================================================
 
 @router.get("/cost-matrix", response_model=CostMatrix)
-async def get_cost_matrix():
+async def get_cost_matrix(request: Request):
     """Récupère la matrice de coûts pour l'apprentissage par renforcement."""
-    service = get_settings_service()
-    return await service.get_cost_matrix()
+    return await render_settings(request, "cost_matrix")
 
 
 @router.put("/cost-matrix", response_model=CostMatrix)
 async def update_cost_matrix(
     matrix: CostMatrix,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -162,7 +177,7 @@ async def update_cost_matrix(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.cost_matrix
 
@@ -172,16 +187,15 @@ async def update_cost_matrix(
 # =============================================================================
 
 @router.get("/models", response_model=ModelSettings)
-async def get_model_settings():
+async def get_model_settings(request: Request):
     """Récupère la configuration des modèles IA."""
-    service = get_settings_service()
-    return await service.get_model_settings()
+    return await render_settings(request, "models")
 
 
 @router.put("/models", response_model=ModelSettings)
 async def update_model_settings(
     models: ModelSettings,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -192,7 +206,7 @@ async def update_model_settings(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.models
 
@@ -202,16 +216,15 @@ async def update_model_settings(
 # =============================================================================
 
 @router.get("/fraud-patterns", response_model=FraudPatternsConfig)
-async def get_fraud_patterns():
+async def get_fraud_patterns(request: Request):
     """Récupère la configuration des patterns de fraude."""
-    service = get_settings_service()
-    return await service.get_fraud_patterns()
+    return await render_settings(request, "fraud_patterns")
 
 
 @router.put("/fraud-patterns", response_model=FraudPatternsConfig)
 async def update_fraud_patterns(
     patterns: FraudPatternsConfig,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -222,7 +235,7 @@ async def update_fraud_patterns(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.fraud_patterns
 
@@ -231,7 +244,7 @@ async def update_fraud_patterns(
 async def update_single_fraud_pattern(
     pattern_id: str,
     pattern_update: dict,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -243,7 +256,7 @@ async def update_single_fraud_pattern(
             pattern_update,
             user_id=user_id,
             user_email=user_email,
-            ip_address=get_client_ip(request)
+            ip_address=client_ip
         )
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -254,16 +267,15 @@ async def update_single_fraud_pattern(
 # =============================================================================
 
 @router.get("/agents", response_model=AgentsConfig)
-async def get_agents_config():
+async def get_agents_config(request: Request):
     """Récupère la configuration des agents et de l'orchestration."""
-    service = get_settings_service()
-    return await service.get_agents_config()
+    return await render_settings(request, "agents")
 
 
 @router.put("/agents", response_model=AgentsConfig)
 async def update_agents_config(
     agents: AgentsConfig,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -274,7 +286,7 @@ async def update_agents_config(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.agents
 
@@ -284,16 +296,15 @@ async def update_agents_config(
 # =============================================================================
 
 @router.get("/features", response_model=FeaturesConfig)
-async def get_features_config():
+async def get_features_config(request: Request):
     """Récupère la configuration des features ML."""
-    service = get_settings_service()
-    return await service.get_features_config()
+    return await render_settings(request, "features")
 
 
 @router.put("/features", response_model=FeaturesConfig)
 async def update_features_config(
     features: FeaturesConfig,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -304,7 +315,7 @@ async def update_features_config(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.features
 
@@ -314,16 +325,15 @@ async def update_features_config(
 # =============================================================================
 
 @router.get("/alert-rules", response_model=AlertRulesConfig)
-async def get_alert_rules():
+async def get_alert_rules(request: Request):
     """Récupère les règles d'alertes et SLA."""
-    service = get_settings_service()
-    return await service.get_alert_rules()
+    return await render_settings(request, "alert_rules")
 
 
 @router.put("/alert-rules", response_model=AlertRulesConfig)
 async def update_alert_rules(
     rules: AlertRulesConfig,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -334,7 +344,7 @@ async def update_alert_rules(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.alert_rules
 
@@ -344,16 +354,15 @@ async def update_alert_rules(
 # =============================================================================
 
 @router.get("/integrations", response_model=IntegrationsConfig)
-async def get_integrations():
+async def get_integrations(request: Request):
     """Récupère la configuration des intégrations externes."""
-    service = get_settings_service()
-    return await service.get_integrations()
+    return await render_settings(request, "integrations")
 
 
 @router.put("/integrations", response_model=IntegrationsConfig)
 async def update_integrations(
     integrations: IntegrationsConfig,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -364,11 +373,20 @@ async def update_integrations(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.integrations
 
 
+@router.post("/integrations/test", response_model=List[ConnectionTestResult])
+async def test_all_integration_connections(
+    names: Optional[List[str]] = Query(None, description="Services a tester (tous par defaut)")
+):
+    """Teste plusieurs connexions externes en parallele."""
+    service = get_settings_service()
+    return await service.test_all_connections(names)
+
+
 @router.post("/integrations/{service_name}/test", response_model=ConnectionTestResult)
 async def test_integration_connection(service_name: str):
     """Teste la connexion à un service externe."""
@@ -381,16 +399,15 @@ async def test_integration_connection(service_name: str):
 # =============================================================================
 
 @router.get("/retention", response_model=RetentionConfig)
-async def get_retention_config():
+async def get_retention_config(request: Request):
     """Récupère les politiques de rétention RGPD."""
-    service = get_settings_service()
-    return await service.get_retention_config()
+    return await render_settings(request, "retention")
 
 
 @router.put("/retention", response_model=RetentionConfig)
 async def update_retention_config(
     retention: RetentionConfig,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -401,7 +418,7 @@ async def update_retention_config(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.retention
 
@@ -411,16 +428,15 @@ async def update_retention_config(
 # =============================================================================
 
 @router.get("/system", response_model=SystemSettings)
-async def get_system_settings():
+async def get_system_settings(request: Request):
     """Récupère les paramètres système."""
-    service = get_settings_service()
-    return await service.get_system_settings()
+    return await render_settings(request, "system")
 
 
 @router.put("/system", response_model=SystemSettings)
 async def update_system_settings(
     system: SystemSettings,
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -431,7 +447,7 @@ async def update_system_settings(
         update,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
     return result.system
 
@@ -453,7 +469,7 @@ async def export_settings():
     filename = f"fraudshield_settings_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
 
     return StreamingResponse(
-        io.BytesIO(content),
+        content,
         media_type="application/json",
         headers={
             "Content-Disposition": f"attachment; filename={filename}",
@@ -462,10 +478,21 @@ async def export_settings():
     )
 
 
+_IMPORT_MAX_BYTES = 1024 * 1024  # 1MB limit
+_IMPORT_CHUNK_SIZE = 64 * 1024
+# Below this size parsing is cheaper than the thread-pool round trip
+_IMPORT_INLINE_PARSE_BYTES = 64 * 1024
+
+
+def _parse_settings(content: bytes) -> AllSettings:
+    """Décode et valide un fichier de configuration."""
+    return AllSettings.model_validate(orjson.loads(content))
+
+
 @router.post("/import", response_model=ImportExportResult)
 async def import_settings(
     file: UploadFile = File(...),
-    request: Request = None,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None
 ):
@@ -477,16 +504,33 @@ async def import_settings(
     if not file.filename.endswith('.json'):
         raise HTTPException(status_code=400, detail="Le fichier doit être au format JSON")
 
-    content = await file.read()
-    if len(content) > 1024 * 1024:  # 1MB limit
-        raise HTTPException(status_code=400, detail="Le fichier est trop volumineux (max 1MB)")
+    # Read in chunks so oversized uploads are rejected before being buffered
+    buffer = bytearray()
+    while chunk := await file.read(_IMPORT_CHUNK_SIZE):
+        buffer += chunk
+        if len(buffer) > _IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=400, detail="Le fichier est trop volumineux (max 1MB)")
+    content = bytes(buffer)
+
+    # Decoding and validating a large configuration is CPU-bound: keep it
+    # off the event loop (typical small files are parsed inline)
+    try:
+        if len(content) < _IMPORT_INLINE_PARSE_BYTES:
+            parsed = _parse_settings(content)
+        else:
+            parsed = await asyncio.to_thread(_parse_settings, content)
+    except orjson.JSONDecodeError as e:
+        return ImportExportResult(success=False, message=f"Invalid JSON: {e}", timestamp=datetime.utcnow())
+    except ValidationError as e:
+        return ImportExportResult(success=False, message=f"Import error: {e}", timestamp=datetime.utcnow())
 
     service = get_settings_service()
     return await service.import_settings(
         content,
+        parsed=parsed,
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request) if request else None
+        ip_address=client_ip
     )
 
 
@@ -496,7 +540,7 @@ async def import_settings(
 
 @router.post("/reset", response_model=AllSettings)
 async def reset_to_defaults(
-    request: Request,
+    client_ip: str = Depends(get_client_ip),
     user_id: Optional[str] = None,
     user_email: Optional[str] = None,
     confirm: bool = False
@@ -517,7 +561,7 @@ async def reset_to_defaults(
     return await service.reset_to_defaults(
         user_id=user_id,
         user_email=user_email,
-        ip_address=get_client_ip(request)
+        ip_address=client_ip
     )
 
 
@@ -526,19 +570,34 @@ async def reset_to_defaults(
 # =============================================================================
 
 @router.get("/audit-log", response_model=List[SettingsAuditLog])
-async def get_audit_log(limit: int = 100, offset: int = 0):
+async def get_audit_log(
+    request: Request,
+    response: Response,
+    limit: int = 100,
+    offset: int = 0,
+    before_id: Optional[str] = None
+):
     """
     Récupère l'historique des modifications.
 
     Paramètres:
     - limit: Nombre maximum d'entrées (défaut: 100, max: 1000)
     - offset: Décalage pour pagination
+    - before_id: Curseur (en-tête X-Next-Cursor de la page précédente)
     """
     if limit > 1000:
         limit = 1000
 
     service = get_settings_service()
-    return await service.get_audit_log(limit=limit, offset=offset)
+    etag = service.audit_etag
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    entries = await service.get_audit_log(limit=limit, offset=offset, before_id=before_id)
+    if len(entries) == limit:
+        response.headers["X-Next-Cursor"] = entries[-1].id
+    return entries
 
 
 # =============================================================================
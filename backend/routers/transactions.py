@@ -3,62 +3,51 @@ FraudShield AI - Transactions Router
 API endpoints for transaction analysis
 """
 
-from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query
-from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, BackgroundTasks, Query
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Discriminator, Tag
+from typing import Annotated, Any, Dict, List, Optional, Union
 from datetime import datetime, timedelta
-import random
+from collections import defaultdict
+from types import MappingProxyType
+import traceback
+import numpy as np
+import orjson
 
 from ..models.requests import TransactionRequest, BatchTransactionRequest, FeedbackRequest, SimpleTransactionRequest
 from ..models.responses import FraudDecisionResponse, BatchResultResponse, TransactionListResponse
+from ..dependencies import get_fraud_service
 from ..services.fraud_service import FraudService
+from ..utils.clock import now_iso
 
 router = APIRouter()
 
 
-def get_fraud_service() -> FraudService:
-    """Dependency injection for fraud service."""
-    from ..main import fraud_service
-    if fraud_service is None:
-        raise HTTPException(status_code=503, detail="Service not initialized")
-    return fraud_service
-
-
 # =============================================================================
 # LIST TRANSACTIONS
 # =============================================================================
 
-@router.get("", response_model=TransactionListResponse)
-async def list_transactions(
-    page: int = Query(1, ge=1, description="Numéro de page"),
-    limit: int = Query(10, ge=1, le=100, description="Nombre d'éléments par page"),
-    status: Optional[str] = Query(None, description="Filtrer par statut"),
-    risk_level: Optional[str] = Query(None, description="Filtrer par niveau de risque"),
-    date_from: Optional[str] = Query(None, description="Date de début (YYYY-MM-DD)"),
-    date_to: Optional[str] = Query(None, description="Date de fin (YYYY-MM-DD)"),
-    service: FraudService = Depends(get_fraud_service)
-):
-    """
-    Liste les transactions avec pagination et filtres.
+MOCK_TRANSACTION_COUNT = 15
 
-    En production, cette endpoint interrogerait la base de données.
-    Pour l'instant, retourne des données mock.
-    """
-    # Mock data - en production, interroger la DB
+
+def _build_mock_transactions() -> List[dict]:
+    """Construit le jeu de transactions mock (une seule fois, a l'import)."""
     mock_transactions = []
     base_date = datetime.now()
+    risk_scores = [0.12, 0.35, 0.58, 0.72, 0.89]
+    risk_levels = ["low", "medium", "medium", "high", "critical"]
+    statuses = ["approved", "pending", "review", "rejected", "investigating"]
+    # All amounts in one vectorized draw (tolist() yields plain floats)
+    amounts = np.round(np.random.default_rng(42).uniform(50, 5000, size=MOCK_TRANSACTION_COUNT), 2).tolist()
 
-    for i in range(15):
+    for i in range(MOCK_TRANSACTION_COUNT):
         tx_date = base_date - timedelta(days=i)
-        risk_scores = [0.12, 0.35, 0.58, 0.72, 0.89]
-        risk_levels = ["low", "medium", "medium", "high", "critical"]
-        statuses = ["approved", "pending", "review", "rejected", "investigating"]
-
         idx = i % 5
         mock_transactions.append({
             "transaction_id": f"TX-2025-{1000 + i:04d}",
             "beneficiary_id": f"BEN-{100 + (i % 10):03d}",
             "beneficiary_name": ["Jean Dupont", "Marie Martin", "Pierre Bernard", "Sophie Leroy", "Luc Moreau"][i % 5],
-            "amount": round(random.uniform(50, 5000), 2),
+            "amount": amounts[i],
             "transaction_type": ["REMBOURSEMENT", "PRESTATION", "PENSION"][i % 3],
             "status": statuses[idx],
             "risk_score": risk_scores[idx],
@@ -67,18 +56,57 @@ async def list_transactions(
             "decision": ["PASS", "FLAG", "BLOCK"][idx % 3] if idx > 0 else "PASS"
         })
 
-    # Appliquer les filtres
-    filtered = mock_transactions
-    if status:
-        filtered = [t for t in filtered if t["status"] == status]
-    if risk_level:
-        filtered = [t for t in filtered if t["risk_level"] == risk_level]
+    return mock_transactions
+
+
+# Mock dataset is built once: requests only filter and slice it
+_MOCK_TX_CACHE: List[dict] = _build_mock_transactions()
+
+# Inverted indexes: field value -> row indices, in dataset order
+_IDX_STATUS: Dict[str, List[int]] = defaultdict(list)
+_IDX_RISK: Dict[str, List[int]] = defaultdict(list)
+for _i, _tx in enumerate(_MOCK_TX_CACHE):
+    _IDX_STATUS[_tx["status"]].append(_i)
+    _IDX_RISK[_tx["risk_level"]].append(_i)
+del _i, _tx
+
+
+@router.get("", response_model=TransactionListResponse)
+async def list_transactions(
+    page: int = Query(1, ge=1, description="Numéro de page"),
+    limit: int = Query(10, ge=1, le=100, description="Nombre d'éléments par page"),
+    status: Optional[str] = Query(None, description="Filtrer par statut"),
+    risk_level: Optional[str] = Query(None, description="Filtrer par niveau de risque"),
+    date_from: Optional[str] = Query(None, description="Date de début (YYYY-MM-DD)"),
+    date_to: Optional[str] = Query(None, description="Date de fin (YYYY-MM-DD)"),
+    service: FraudService = Depends(get_fraud_service)
+):
+    """
+    Liste les transactions avec pagination et filtres.
+
+    En production, cette endpoint interrogerait la base de données.
+    Pour l'instant, retourne des données mock.
+    """
+    # Mock data - en production, interroger la DB
+    # Appliquer les filtres via les index inverses
+    if status and risk_level:
+        indices = sorted(set(_IDX_STATUS.get(status, ())) & set(_IDX_RISK.get(risk_level, ())))
+    elif status:
+        indices = _IDX_STATUS.get(status, [])
+    elif risk_level:
+        indices = _IDX_RISK.get(risk_level, [])
+    else:
+        indices = None
 
     # Pagination
-    total = len(filtered)
     start = (page - 1) * limit
     end = start + limit
-    paginated = filtered[start:end]
+    if indices is None:
+        total = len(_MOCK_TX_CACHE)
+        paginated = _MOCK_TX_CACHE[start:end]
+    else:
+        total = len(indices)
+        paginated = [_MOCK_TX_CACHE[i] for i in indices[start:end]]
 
     return TransactionListResponse(
         transactions=paginated,
@@ -92,71 +120,150 @@ async def list_transactions(
 # ANALYZE TRANSACTION
 # =============================================================================
 
+# Request fields forwarded to the fraud service
+_ANALYZE_PAYLOAD_FIELDS = {"transaction", "documents", "beneficiary"}
+
+# Stands in for a missing service result (read-only)
+_EMPTY_RESULT = MappingProxyType({})
+
+# Orchestrator decisions mapped to the response enum values
+_DECISION_MAP = {"PASS": "PASS", "FLAG": "FLAG", "BLOCK": "BLOCK", "REVIEW": "FLAG"}
+
+
+# Generic 500 body: exception text stays in the server log, not the response
+_INTERNAL_ERROR_BODY = orjson.dumps({"error": "Internal server error", "status_code": 500})
+
+
+def _internal_error(exc: Exception) -> Response:
+    """Journalise l'exception et renvoie une erreur 500 generique."""
+    print(f"[ERROR] Transaction endpoint failed: {type(exc).__name__}")
+    traceback.print_exception(type(exc), exc, exc.__traceback__)
+    return Response(content=_INTERNAL_ERROR_BODY, status_code=500, media_type="application/json")
+
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialise un modele de reponse deja construit.
+
+    Evite la re-validation par response_model et le passage par
+    jsonable_encoder: un seul model_dump_json (serialiseur compile).
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
+
+async def _analyze(request: TransactionRequest, bypass_cache: bool, service: FraudService) -> Response:
+    """Analyse une requete au format complet et construit la reponse."""
+    # Convert Pydantic models to dicts (single model_dump walk)
+    payload = request.model_dump(include=_ANALYZE_PAYLOAD_FIELDS)
+
+    result = await service.process_transaction(
+        transaction=payload["transaction"],
+        documents=payload.get("documents") or [],
+        beneficiary=payload.get("beneficiary"),
+        workflow=request.workflow.value,
+        user_id=request.user_id,
+        bypass_cache=bypass_cache
+    )
+
+    # Transform to response model (bound lookup, no default dict per call)
+    get = (result.get("result") or _EMPTY_RESULT).get
+    summary = get("analysis_summary")
+
+    # Map decision to valid enum values
+    decision = _DECISION_MAP.get(get("decision", "FLAG"), "FLAG")
+
+    return _json_response(FraudDecisionResponse(
+        status="success",
+        transaction_id=get("transaction_id", ""),
+        case_id=get("case_id", ""),
+        decision=decision,
+        fraud_probability=get("fraud_probability", 0),
+        risk_level=get("risk_level", "low"),
+        confidence=get("confidence", 0),
+        component_scores=summary.get("component_scores", {}) if summary else {},
+        anomalies=[],
+        patterns=[],
+        key_findings=get("key_findings", []),
+        explanation=get("explanation", ""),
+        recommendations=get("recommendations", []),
+        workflow=request.workflow.value,
+        processing_time_ms=get("processing_time_ms", 0),
+        generated_at=get("generated_at") or now_iso()
+    ))
+
+
+def _request_format(value: Any) -> str:
+    """Format de la requete /analyze: complet si la cle transaction est presente."""
+    if isinstance(value, dict):
+        return "full" if "transaction" in value else "simple"
+    return "simple" if isinstance(value, SimpleTransactionRequest) else "full"
+
+
+# /analyze still accepts the flat format for one release (deprecated): the
+# discriminator picks the schema from the payload shape, so each body is
+# validated against one model only
+AnalyzeRequest = Annotated[
+    Union[
+        Annotated[TransactionRequest, Tag("full")],
+        Annotated[SimpleTransactionRequest, Tag("simple")],
+    ],
+    Discriminator(_request_format),
+]
+
+_SIMPLE_FORMAT_DEPRECATION_HEADERS = MappingProxyType({
+    "Deprecation": "true",
+    "Link": '</api/v1/transactions/analyze/simple>; rel="successor-version"',
+})
+
+
 @router.post("/analyze", response_model=FraudDecisionResponse)
 async def analyze_transaction(
-    request: Union[TransactionRequest, SimpleTransactionRequest],
+    request: AnalyzeRequest,
     background_tasks: BackgroundTasks,
+    bypass_cache: bool = Query(False, description="Forcer une nouvelle analyse (ignorer le cache)"),
     service: FraudService = Depends(get_fraud_service)
 ):
     """
     Analyser une transaction pour détecter la fraude.
 
-    Accepte deux formats de requête:
-    - **Format complet** (TransactionRequest): Structure imbriquée avec transaction, documents, beneficiary
-    - **Format simplifié** (SimpleTransactionRequest): Structure plate pour intégration frontend
+    Format complet (TransactionRequest): structure imbriquée avec
+    transaction, documents, beneficiary. Le format simplifié est servi
+    par `/analyze/simple`; il est encore accepté ici mais déprécié
+    (en-tête `Deprecation`) et sera retiré à la prochaine version.
 
     Utilise le workflow spécifié pour l'analyse:
     - **quick**: Pré-screening rapide
     - **standard**: Analyse complète
     - **investigation**: Analyse approfondie avec rapport
     """
-    try:
-        # Convertir si format simplifié
-        if isinstance(request, SimpleTransactionRequest):
-            request = request.to_full_request()
-
-        # Convert Pydantic models to dicts
-        transaction_dict = request.transaction.dict()
-        documents_list = [doc.dict() for doc in request.documents] if request.documents else []
-        beneficiary_dict = request.beneficiary.dict() if request.beneficiary else None
-
-        result = await service.process_transaction(
-            transaction=transaction_dict,
-            documents=documents_list,
-            beneficiary=beneficiary_dict,
-            workflow=request.workflow.value,
-            user_id=request.user_id
-        )
+    if isinstance(request, SimpleTransactionRequest):
+        response = await analyze_simple_transaction(request, background_tasks, bypass_cache, service)
+        response.headers.update(_SIMPLE_FORMAT_DEPRECATION_HEADERS)
+        return response
 
-        # Transform to response model
-        fraud_result = result.get("result", {})
+    try:
+        return await _analyze(request, bypass_cache, service)
+    except Exception as e:
+        return _internal_error(e)
 
-        # Map decision to valid enum values
-        raw_decision = fraud_result.get("decision", "FLAG")
-        decision_map = {"PASS": "PASS", "FLAG": "FLAG", "BLOCK": "BLOCK", "REVIEW": "FLAG"}
-        decision = decision_map.get(raw_decision, "FLAG")
 
-        return FraudDecisionResponse(
-            status="success",
-            transaction_id=fraud_result.get("transaction_id", ""),
-            case_id=fraud_result.get("case_id", ""),
-            decision=decision,
-            fraud_probability=fraud_result.get("fraud_probability", 0),
-            risk_level=fraud_result.get("risk_level", "low"),
-            confidence=fraud_result.get("confidence", 0),
-            component_scores=fraud_result.get("analysis_summary", {}).get("component_scores", {}),
-            anomalies=[],
-            patterns=[],
-            key_findings=fraud_result.get("key_findings", []),
-            explanation=fraud_result.get("explanation", ""),
-            recommendations=fraud_result.get("recommendations", []),
-            workflow=request.workflow.value,
-            processing_time_ms=fraud_result.get("processing_time_ms", 0),
-            generated_at=fraud_result.get("generated_at", datetime.now().isoformat())
-        )
+@router.post("/analyze/simple", response_model=FraudDecisionResponse)
+async def analyze_simple_transaction(
+    request: SimpleTransactionRequest,
+    background_tasks: BackgroundTasks,
+    bypass_cache: bool = Query(False, description="Forcer une nouvelle analyse (ignorer le cache)"),
+    service: FraudService = Depends(get_fraud_service)
+):
+    """
+    Analyser une transaction au format simplifié.
 
+    Structure plate (SimpleTransactionRequest) pour intégration frontend;
+    même réponse et mêmes workflows que `/analyze`.
+    """
+    try:
+        return await _analyze(request.to_full_request(), bypass_cache, service)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return _internal_error(e)
 
 
 @router.post("/batch", response_model=BatchResultResponse)
@@ -170,7 +277,7 @@ async def batch_analyze(
     Limite: 1000 transactions par requête.
     """
     try:
-        transactions = [tx.dict() for tx in request.transactions]
+        transactions = request.model_dump(include={"transactions"})["transactions"]
 
         result = await service.process_batch(
             transactions=transactions,
@@ -179,7 +286,7 @@ async def batch_analyze(
 
         batch_result = result.get("result", {})
 
-        return BatchResultResponse(
+        return _json_response(BatchResultResponse(
             status="success",
             batch_id=request.batch_id or f"BATCH-{datetime.now().strftime('%Y%m%d%H%M%S')}",
             transactions_processed=batch_result.get("transactions_processed", 0),
@@ -188,11 +295,56 @@ async def batch_analyze(
             average_fraud_probability=batch_result.get("average_fraud_probability", 0),
             results=batch_result.get("results", []),
             processing_time_ms=batch_result.get("processing_time_ms", 0),
-            generated_at=datetime.now().isoformat()
-        )
+            generated_at=now_iso()
+        ))
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return _internal_error(e)
+
+
+@router.post("/batch/stream")
+async def batch_analyze_stream(
+    request: BatchTransactionRequest,
+    service: FraudService = Depends(get_fraud_service)
+):
+    """
+    Traitement batch avec resultats en flux (NDJSON).
+
+    Une ligne d'en-tete (type "batch"), puis une ligne par transaction des
+    qu'elle est analysee (type "result", ordre d'achevement), puis une ligne
+    de synthese (type "summary").
+    """
+    transactions = request.model_dump(include={"transactions"})["transactions"]
+    batch_id = request.batch_id or f"BATCH-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+
+    async def lines():
+        yield orjson.dumps({
+            "type": "batch",
+            "batch_id": batch_id,
+            "transactions": len(transactions),
+            "started_at": now_iso(),
+        }) + b"\n"
+
+        processed = flagged = 0
+        total_fraud_prob = 0.0
+        async for entry in service.stream_batch(transactions):
+            processed += 1
+            if entry.get("recommended_action") == "FLAG":
+                flagged += 1
+            total_fraud_prob += entry.get("fraud_probability") or 0
+            yield orjson.dumps({"type": "result", **entry}) + b"\n"
+
+        yield orjson.dumps({
+            "type": "summary",
+            "batch_id": batch_id,
+            "transactions_processed": processed,
+            "flagged_count": flagged,
+            "pass_count": processed - flagged,
+            "average_fraud_probability": round(total_fraud_prob / processed, 4) if processed else 0,
+            "generated_at": now_iso(),
+        }) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/{transaction_id}")
@@ -231,7 +383,7 @@ async def submit_feedback(
         return result
 
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        return _internal_error(e)
 
 
 @router.get("/history/{beneficiary_id}")
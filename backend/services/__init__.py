@@ -6,3 +6,10 @@ Business logic services
 from .fraud_service import FraudService
 from .websocket_manager import WebSocketManager
 from .settings_service import SettingsService, get_settings_service
+
+__all__ = [
+    "FraudService",
+    "WebSocketManager",
+    "SettingsService",
+    "get_settings_service",
+]
@@ -3,16 +3,51 @@ FraudShield AI - Fraud Detection Service
 Bridge between FastAPI and FraudShield core
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
 import asyncio
+import copy
+import hashlib
+import orjson
 
-# Import FraudShield core
-import sys
-sys.path.insert(0, '..')
+# FraudShield core (repository root must be on the import path, as with
+# `uvicorn backend.main:app` from the root or PYTHONPATH=/app in Docker)
 from fraudshield.app import FraudShieldApp, get_app
 from fraudshield.agents.base_agent import AgentContext
 
+from ..utils.cache import ttl_cache
+
+# Network traversal cost grows exponentially with depth: cap it, and cache
+# results briefly since the graph changes slowly
+MAX_NETWORK_DEPTH = 3
+NETWORK_CACHE_TTL_SECONDS = 60
+
+# Ring scans run community detection over the whole graph: results are kept
+# until the graph changes (graph_version), the TTL only bounds staleness
+RING_SCAN_CACHE_TTL_SECONDS = 3600
+
+# Replayed transactions (client retries, duplicate submissions) are answered
+# from cache instead of re-running the agent pipeline
+TRANSACTION_CACHE_TTL_SECONDS = 300
+TRANSACTION_CACHE_MAXSIZE = 10_000
+
+
+
+def _transaction_cache_key(
+    service: "FraudService",
+    transaction: Dict[str, Any],
+    documents: Optional[List[Dict]] = None,
+    beneficiary: Optional[Dict[str, Any]] = None,
+    workflow: str = "standard"
+) -> bytes:
+    """Digest of the canonicalized analysis inputs."""
+    payload = orjson.dumps(
+        (transaction, documents or [], beneficiary, workflow),
+        option=orjson.OPT_SORT_KEYS,
+        default=str
+    )
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
 
 class FraudService:
     """
@@ -25,10 +60,19 @@ class FraudService:
         """Initialize fraud service."""
         self.app: Optional[FraudShieldApp] = None
         self.initialized = False
+        # Bumped whenever transactions are ingested (invalidates ring scans)
+        self.graph_version = 0
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self):
         """Initialize the service and underlying FraudShield app."""
-        if not self.initialized:
+        if self.initialized:
+            return
+        # Concurrent callers wait for the first one instead of each building
+        # the app (and a process pool)
+        async with self._init_lock:
+            if self.initialized:
+                return
             self.app = get_app()
             self.initialized = True
 
@@ -42,17 +86,24 @@ class FraudService:
         documents: Optional[List[Dict]] = None,
         beneficiary: Optional[Dict[str, Any]] = None,
         workflow: str = "standard",
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> Dict[str, Any]:
         """
         Process a transaction for fraud detection.
 
+        Identical inputs within TRANSACTION_CACHE_TTL_SECONDS reuse the
+        cached orchestrator result (concurrent duplicates share one
+        analysis); notification, RL bookkeeping and the response envelope
+        run on every call.
+
         Args:
             transaction: Transaction data
             documents: Optional documents
             beneficiary: Optional beneficiary data
             workflow: Workflow type
             user_id: User ID for notifications
+            bypass_cache: Force a fresh analysis
 
         Returns:
             Fraud detection result
@@ -60,13 +111,39 @@ class FraudService:
         if not self.initialized or self.app is None:
             raise RuntimeError("Service not initialized")
 
-        result = await self.app.process_transaction(
+        inputs = dict(
             transaction=transaction,
             documents=documents,
             beneficiary=beneficiary,
-            workflow=workflow,
-            user_id=user_id
+            workflow=workflow
+        )
+        if bypass_cache:
+            result = await FraudService._analyze_transaction.__wrapped__(self, **inputs)
+        else:
+            # Private copy: the cached result is shared between hits
+            result = copy.deepcopy(await self._analyze_transaction(**inputs))
+        return await self.app.complete_transaction(result, transaction, user_id)
+
+    @ttl_cache(
+        ttl_seconds=TRANSACTION_CACHE_TTL_SECONDS,
+        maxsize=TRANSACTION_CACHE_MAXSIZE,
+        key=_transaction_cache_key
+    )
+    async def _analyze_transaction(
+        self,
+        transaction: Dict[str, Any],
+        documents: Optional[List[Dict]] = None,
+        beneficiary: Optional[Dict[str, Any]] = None,
+        workflow: str = "standard"
+    ) -> Dict[str, Any]:
+        """Run the agent pipeline for one transaction (cached by inputs)."""
+        result = await self.app.analyze_transaction(
+            transaction=transaction,
+            documents=documents,
+            beneficiary=beneficiary,
+            workflow=workflow
         )
+        self.graph_version += 1
 
         return result
 
@@ -92,9 +169,31 @@ class FraudService:
             transactions=transactions,
             user_id=user_id
         )
+        self.graph_version += 1
 
         return result
 
+    async def stream_batch(
+        self,
+        transactions: List[Dict[str, Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process batch of transactions, yielding results as they complete.
+
+        Args:
+            transactions: List of transactions
+
+        Yields:
+            Per-transaction results (completion order)
+        """
+        if not self.initialized or self.app is None:
+            raise RuntimeError("Service not initialized")
+
+        context = AgentContext()
+        async for entry in self.app.orchestrator.transaction_analyst.iter_batch(transactions, context):
+            yield entry
+        self.graph_version += 1
+
     async def analyze_documents(
         self,
         documents: List[Dict[str, Any]],
@@ -145,6 +244,7 @@ class FraudService:
 
         return result
 
+    @ttl_cache(ttl_seconds=NETWORK_CACHE_TTL_SECONDS, maxsize=1024, exclude=())
     async def analyze_network(
         self,
         entity_id: str,
@@ -157,7 +257,7 @@ class FraudService:
         Args:
             entity_id: Entity to analyze
             entity_type: Type of entity
-            depth: Analysis depth
+            depth: Analysis depth (capped at MAX_NETWORK_DEPTH)
 
         Returns:
             Network analysis result
@@ -165,6 +265,8 @@ class FraudService:
         if not self.initialized or self.app is None:
             raise RuntimeError("Service not initialized")
 
+        depth = min(depth, MAX_NETWORK_DEPTH)
+
         context = AgentContext()
         result = await self.app.orchestrator.network_analyzer.analyze(
             entity_id, context, entity_type, depth
@@ -172,6 +274,27 @@ class FraudService:
 
         return result
 
+    async def scan_fraud_rings(self, min_size: int = 3) -> Dict[str, Any]:
+        """
+        Scan the whole network for fraud rings.
+
+        Args:
+            min_size: Minimum ring size
+
+        Returns:
+            Fraud ring scan results
+        """
+        if not self.initialized or self.app is None:
+            raise RuntimeError("Service not initialized")
+
+        return await self._scan_fraud_rings(self.graph_version, min_size)
+
+    @ttl_cache(ttl_seconds=RING_SCAN_CACHE_TTL_SECONDS, maxsize=64, exclude=())
+    async def _scan_fraud_rings(self, graph_version: int, min_size: int) -> Dict[str, Any]:
+        """Run the ring scan (cached per graph version and ring size)."""
+        context = AgentContext()
+        return await self.app.orchestrator.network_analyzer.scan_for_rings(context, min_size)
+
     async def create_investigation_report(
         self,
         case_id: str,
@@ -3,16 +3,18 @@ FraudShield AI - Settings Service
 Business logic for system configuration management with JSON file persistence
 """
 
-import json
 import hashlib
-import aiofiles
+import orjson
 import asyncio
+import os
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Callable, Awaitable
 from uuid import uuid4
 import httpx
 
+from ..utils.fileio import read_bytes, write_bytes
 from ..models.settings import (
     AllSettings,
     SettingsUpdateRequest,
@@ -34,14 +36,65 @@ from ..models.settings import (
 )
 
 
+# Sections read by validate_settings (key of the validation cache)
+_VALIDATED_SECTIONS = {"risk_thresholds", "cost_matrix", "agents", "models"}
+VALIDATION_CACHE_SIZE = 256
+
+# Import/export checksum: BLAKE2b sized to the 16 hex characters exposed
+CHECKSUM_DIGEST_SIZE = 8
+
+# Sections of SettingsUpdateRequest applied by update_settings
+_UPDATABLE_SECTIONS = (
+    "risk_thresholds", "cost_matrix", "models", "fraud_patterns", "agents",
+    "features", "alert_rules", "integrations", "retention", "system",
+)
+
+# Pending audit entries are written when the batch is full or after the interval
+AUDIT_FLUSH_BATCH_SIZE = 64
+AUDIT_FLUSH_INTERVAL_SECONDS = 0.5
+
+# The audit file is append-only JSONL: it is trimmed back to AUDIT_MAX_ENTRIES
+# once it exceeds AUDIT_TRIM_THRESHOLD lines (one rewrite every 200 entries)
+AUDIT_MAX_ENTRIES = 1000
+AUDIT_TRIM_THRESHOLD = 1200
+
+# Section updates are appended to a write-ahead log; settings.json is only
+# rewritten (and the log truncated) past this many records or on shutdown
+WAL_COMPACT_THRESHOLD = 200
+
+
 class SettingsService:
     """Service de gestion des paramètres système."""
 
-    def __init__(self, settings_file: str = "data/settings.json", audit_file: str = "data/settings_audit.json"):
+    def __init__(self, settings_file: str = "data/settings.json", audit_file: str = "data/settings_audit.jsonl"):
         self.settings_file = Path(settings_file)
         self.audit_file = Path(audit_file)
+        self.wal_file = self.settings_file.with_name(f"{self.settings_file.stem}.wal.jsonl")
+        self._wal_records = 0
         self._settings_cache: Optional[AllSettings] = None
+        self._etags: Dict[str, str] = {}
+        self._bodies: Dict[str, bytes] = {}
         self._lock = asyncio.Lock()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._validation_cache: Dict[bytes, ValidationResult] = {}
+        self._http_client: Optional[httpx.AsyncClient] = None
+        # (integrations section, name -> entry) for test_connection
+        self._integration_index: Optional[tuple[IntegrationsConfig, Dict[str, Any]]] = None
+        # Last JSON-mode dump of each updated section (audit pre-images)
+        self._dump_cache: Dict[str, dict] = {}
+
+        # Audit entries are buffered and written to disk in batches
+        self._audit_buffer: List[SettingsAuditLog] = []
+        self._audit_lock = asyncio.Lock()
+        self._audit_flush_task: Optional[asyncio.Task] = None
+        # In-memory copy of the audit file (oldest first) and id -> position,
+        # for keyset pagination
+        self._audit_entries: Optional[List[dict]] = None
+        self._audit_positions: Dict[str, int] = {}
+        # Audit log version for HTTP revalidation: bumped per entry; the epoch
+        # keeps validators from a previous process from ever matching
+        self.audit_version = 0
+        self._audit_epoch = uuid4().hex[:12]
 
         # Ensure data directory exists
         self.settings_file.parent.mkdir(parents=True, exist_ok=True)
@@ -57,10 +110,10 @@ class SettingsService:
 
         if self.settings_file.exists():
             try:
-                async with aiofiles.open(self.settings_file, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    data = json.loads(content)
-                    self._settings_cache = AllSettings(**data)
+                # Both reads are issued together (one submission batch with caio)
+                content, wal = await asyncio.gather(read_bytes(self.settings_file), self._read_wal())
+                data = self._replay_wal(orjson.loads(content), wal)
+                self._settings_cache = AllSettings(**data)
             except Exception as e:
                 print(f"Error loading settings: {e}")
                 self._settings_cache = self._get_default_settings()
@@ -72,9 +125,29 @@ class SettingsService:
 
     async def get_all_settings(self) -> AllSettings:
         """Récupère tous les paramètres."""
+        if self._settings_cache is not None:
+            return self._settings_cache
+        return await self._single_flight("settings", self._load_settings)
+
+    async def _load_settings(self) -> AllSettings:
         async with self._lock:
             return await self._get_settings_unlocked()
 
+    async def _single_flight(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Exécute `load` une seule fois pour tous les appels concurrents sur `key`.
+
+        Le premier appelant lance le chargement; les suivants attendent le
+        même résultat au lieu de refaire le travail.
+        """
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shielded: a cancelled caller must not cancel the shared load
+        return await asyncio.shield(task)
+
     async def update_settings(
         self,
         update: SettingsUpdateRequest,
@@ -88,53 +161,41 @@ class SettingsService:
 
             # Track changes for audit
             changes = []
-
-            if update.risk_thresholds is not None:
-                changes.append(("risk_thresholds", current.risk_thresholds.model_dump(), update.risk_thresholds.model_dump()))
-                current.risk_thresholds = update.risk_thresholds
-
-            if update.cost_matrix is not None:
-                changes.append(("cost_matrix", current.cost_matrix.model_dump(), update.cost_matrix.model_dump()))
-                current.cost_matrix = update.cost_matrix
-
-            if update.models is not None:
-                changes.append(("models", current.models.model_dump(), update.models.model_dump()))
-                current.models = update.models
-
-            if update.fraud_patterns is not None:
-                changes.append(("fraud_patterns", current.fraud_patterns.model_dump(), update.fraud_patterns.model_dump()))
-                current.fraud_patterns = update.fraud_patterns
-
-            if update.agents is not None:
-                changes.append(("agents", current.agents.model_dump(), update.agents.model_dump()))
-                current.agents = update.agents
-
-            if update.features is not None:
-                changes.append(("features", current.features.model_dump(), update.features.model_dump()))
-                current.features = update.features
-
-            if update.alert_rules is not None:
-                changes.append(("alert_rules", current.alert_rules.model_dump(), update.alert_rules.model_dump()))
-                current.alert_rules = update.alert_rules
-
-            if update.integrations is not None:
-                changes.append(("integrations", current.integrations.model_dump(), update.integrations.model_dump()))
-                current.integrations = update.integrations
-
-            if update.retention is not None:
-                changes.append(("retention", current.retention.model_dump(), update.retention.model_dump()))
-                current.retention = update.retention
-
-            if update.system is not None:
-                changes.append(("system", current.system.model_dump(), update.system.model_dump()))
-                current.system = update.system
-
-            # Update metadata
-            current.updated_at = datetime.utcnow()
-            current.updated_by = user_email or user_id
-
-            # Save and audit
-            await self._save_settings(current)
+            sections: Dict[str, Any] = {}
+
+            for name in _UPDATABLE_SECTIONS:
+                value = getattr(update, name)
+                if value is None:
+                    continue
+                # Pre-image: the dump recorded by the previous update, if any
+                old_value = self._dump_cache.get(name)
+                if old_value is None:
+                    old_value = getattr(current, name).model_dump(mode="json")
+                new_value = value.model_dump(mode="json")
+                if new_value == old_value:
+                    # Round-tripped unchanged (the UI sends whole sections):
+                    # nothing to persist or audit
+                    self._dump_cache[name] = old_value
+                    continue
+                changes.append((name, old_value, new_value))
+                sections[name] = value
+
+            if not changes:
+                return current
+
+            now = datetime.utcnow()
+            # Copy-on-write: readers keep the snapshot they already hold, the
+            # new one is published by rebinding _settings_cache below
+            current = current.model_copy(update={
+                **sections,
+                "updated_at": now,
+                "updated_by": user_email or user_id,
+            })
+
+            # Persist only the changed sections, then audit
+            await self._append_wal(current, changes)
+            for setting_type, _, new_value in changes:
+                self._dump_cache[setting_type] = new_value
 
             for setting_type, old_value, new_value in changes:
                 await self._log_audit(
@@ -144,16 +205,132 @@ class SettingsService:
                     user_id=user_id,
                     user_email=user_email,
                     ip_address=ip_address,
-                    action="update"
+                    action="update",
+                    timestamp=now
                 )
 
             self._settings_cache = current
+            self._invalidate_rendered()
             return current
 
+    async def get_etag(self, section: Optional[str] = None) -> str:
+        """
+        Retourne l'ETag des paramètres (ou d'une section).
+
+        Calculé une fois puis mis en cache jusqu'à la prochaine modification.
+
+        Args:
+            section: Nom de la section (ex: "cost_matrix"), None pour l'ensemble
+
+        Returns:
+            ETag HTTP (entre guillemets)
+        """
+        etag, _ = await self.get_rendered(section)
+        return etag
+
+    async def get_rendered(self, section: Optional[str] = None) -> tuple[str, bytes]:
+        """
+        Retourne les paramètres (ou une section) sérialisés en JSON avec leur ETag.
+
+        La sérialisation est faite une fois puis mise en cache jusqu'à la
+        prochaine modification.
+
+        Args:
+            section: Nom de la section (ex: "cost_matrix"), None pour l'ensemble
+
+        Returns:
+            (ETag HTTP, corps JSON)
+        """
+        key = section or "all"
+        body = self._bodies.get(key)
+        if body is not None:
+            return self._etags[key], body
+        return await self._single_flight(f"rendered:{key}", lambda: self._render(section))
+
+    async def _render(self, section: Optional[str]) -> tuple[str, bytes]:
+        key = section or "all"
+        async with self._lock:
+            body = self._bodies.get(key)
+            if body is None:
+                settings = await self._get_settings_unlocked()
+                model = settings if section is None else getattr(settings, section)
+                body = self._bodies[key] = model.model_dump_json().encode()
+                digest = hashlib.sha256(body, usedforsecurity=False)
+                self._etags[key] = f'"{digest.hexdigest()[:32]}"'
+            return self._etags[key], body
+
+    def _invalidate_rendered(self) -> None:
+        """Vide les ETags et corps JSON en cache (appeler avec le lock)."""
+        self._etags.clear()
+        self._bodies.clear()
+
     async def _save_settings(self, settings: AllSettings) -> None:
-        """Sauvegarde les paramètres dans le fichier JSON."""
-        async with aiofiles.open(self.settings_file, 'w', encoding='utf-8') as f:
-            await f.write(settings.model_dump_json(indent=2))
+        """
+        Sauvegarde l'ensemble des paramètres dans le fichier JSON.
+
+        Écriture dans un fichier temporaire puis renommage atomique; le
+        journal (WAL) est ensuite vidé puisque le fichier le contient.
+        """
+        tmp_file = self.settings_file.with_name(f"{self.settings_file.name}.tmp")
+        await write_bytes(tmp_file, settings.model_dump_json(indent=2).encode("utf-8"), fsync=True)
+        os.replace(tmp_file, self.settings_file)
+        # Replaying records already in the file is harmless, so a crash
+        # before this truncation loses nothing
+        await write_bytes(self.wal_file, b"")
+        self._wal_records = 0
+
+    async def _append_wal(self, settings: AllSettings, changes: List[tuple]) -> None:
+        """
+        Ajoute une mise à jour (sections modifiées) au journal.
+
+        Un enregistrement par mise à jour, écrit en une seule fois; compacte
+        le journal au-delà de WAL_COMPACT_THRESHOLD enregistrements.
+        """
+        record = {
+            "ts": settings.updated_at,
+            "by": settings.updated_by,
+            "sections": {setting_type: new_value for setting_type, _, new_value in changes},
+        }
+        await write_bytes(self.wal_file, orjson.dumps(record) + b"\n", append=True)
+        self._wal_records += 1
+        if self._wal_records > WAL_COMPACT_THRESHOLD:
+            await self._save_settings(settings)
+
+    async def _read_wal(self) -> bytes:
+        """Lit le journal (vide s'il n'existe pas)."""
+        if not self.wal_file.exists():
+            return b""
+        return await read_bytes(self.wal_file)
+
+    def _replay_wal(self, data: Dict[str, Any], content: bytes) -> Dict[str, Any]:
+        """Applique les enregistrements du journal aux données du fichier JSON."""
+        self._wal_records = 0
+        for line in content.splitlines():
+            try:
+                record = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                # Torn last write (crash mid-append): the update was not acknowledged
+                print(f"Skipping corrupt settings WAL record in {self.wal_file}")
+                continue
+            data.update(record["sections"])
+            data["updated_at"] = record["ts"]
+            data["updated_by"] = record["by"]
+            self._wal_records += 1
+        return data
+
+    async def compact(self) -> None:
+        """Réécrit le fichier JSON et vide le journal s'il contient des mises à jour."""
+        async with self._lock:
+            if self._wal_records and self._settings_cache is not None:
+                await self._save_settings(self._settings_cache)
+
+    async def close(self) -> None:
+        """Écrit l'audit en attente, compacte le journal et ferme le client HTTP."""
+        await self.flush_audit_log()
+        await self.compact()
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
     # =========================================================================
     # SECTION-SPECIFIC GETTERS
@@ -247,7 +424,8 @@ class SettingsService:
     ) -> FraudPattern:
         """Met à jour un pattern de fraude spécifique."""
         settings = await self.get_all_settings()
-        patterns = settings.fraud_patterns.patterns
+        # Copy: the cached snapshot is shared with concurrent readers
+        patterns = list(settings.fraud_patterns.patterns)
 
         for i, p in enumerate(patterns):
             if p.id == pattern_id:
@@ -266,7 +444,27 @@ class SettingsService:
     # =========================================================================
 
     async def validate_settings(self, settings: SettingsUpdateRequest) -> ValidationResult:
-        """Valide les paramètres avant sauvegarde."""
+        """
+        Valide les paramètres avant sauvegarde.
+
+        Le résultat ne dépend que du contenu des sections validées: il est
+        mémorisé par empreinte de ce contenu (sauvegardes automatiques
+        répétées avec le même payload).
+        """
+        key = hashlib.blake2b(
+            settings.model_dump_json(include=_VALIDATED_SECTIONS).encode(),
+            digest_size=16
+        ).digest()
+        result = self._validation_cache.get(key)
+        if result is None:
+            result = self._validate(settings)
+            if len(self._validation_cache) >= VALIDATION_CACHE_SIZE:
+                self._validation_cache.pop(next(iter(self._validation_cache)))
+            self._validation_cache[key] = result
+        return result
+
+    @staticmethod
+    def _validate(settings: SettingsUpdateRequest) -> ValidationResult:
         errors = []
         warnings = []
 
@@ -315,31 +513,62 @@ class SettingsService:
     # CONNECTION TESTING
     # =========================================================================
 
+    def _get_integration_index(self, integrations: IntegrationsConfig) -> Dict[str, Any]:
+        """
+        Index nom -> intégration de la section fournie.
+
+        Reconstruit seulement quand la section change (nouvel objet à chaque
+        mise à jour, copy-on-write). En cas de doublon, la dernière liste
+        l'emporte (serveurs MCP, puis bases, puis APIs).
+        """
+        cached = self._integration_index
+        if cached is None or cached[0] is not integrations:
+            index = {
+                entry.name: entry
+                for entries in (integrations.apis, integrations.databases, integrations.mcp_servers)
+                for entry in entries
+            }
+            cached = self._integration_index = (integrations, index)
+        return cached[1]
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Client HTTP partagé (connexions keep-alive réutilisées entre les tests)."""
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(10.0, connect=3.0),
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._http_client
+
+    async def test_all_connections(self, names: Optional[List[str]] = None) -> List[ConnectionTestResult]:
+        """
+        Teste plusieurs intégrations en parallèle.
+
+        Args:
+            names: Noms des services (None pour toutes les intégrations)
+
+        Returns:
+            Résultats, dans l'ordre des noms
+        """
+        if names is None:
+            settings = await self.get_all_settings()
+            names = list(self._get_integration_index(settings.integrations))
+        return await asyncio.gather(*(self.test_connection(name) for name in names))
+
     async def test_connection(self, service_name: str) -> ConnectionTestResult:
         """Teste la connexion à un service externe."""
+        # One clock read for tested_at; latency uses the monotonic clock
+        now = datetime.utcnow()
         settings = await self.get_all_settings()
-        integration = None
-
-        # Find the integration
-        for api in settings.integrations.apis:
-            if api.name == service_name:
-                integration = api
-                break
-        for db in settings.integrations.databases:
-            if db.name == service_name:
-                integration = db
-                break
-        for mcp in settings.integrations.mcp_servers:
-            if mcp.name == service_name:
-                integration = mcp
-                break
+        integration = self._get_integration_index(settings.integrations).get(service_name)
 
         if not integration:
             return ConnectionTestResult(
                 service_name=service_name,
                 success=False,
                 error_message=f"Service not found: {service_name}",
-                tested_at=datetime.utcnow()
+                tested_at=now
             )
 
         if not integration.url:
@@ -347,61 +576,91 @@ class SettingsService:
                 service_name=service_name,
                 success=False,
                 error_message="URL not configured",
-                tested_at=datetime.utcnow()
+                tested_at=now
             )
 
         # Test HTTP connection
         try:
-            start = datetime.utcnow()
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # For HTTP services, try a simple GET
-                if integration.url.startswith(('http://', 'https://')):
-                    response = await client.get(integration.url)
-                    latency = int((datetime.utcnow() - start).total_seconds() * 1000)
-                    return ConnectionTestResult(
-                        service_name=service_name,
-                        success=response.status_code < 500,
-                        latency_ms=latency,
-                        tested_at=datetime.utcnow()
-                    )
-                else:
-                    # For non-HTTP (db connections), just report as not testable via HTTP
-                    return ConnectionTestResult(
-                        service_name=service_name,
-                        success=True,
-                        error_message="Database connection testing not implemented",
-                        tested_at=datetime.utcnow()
-                    )
+            start_ns = time.perf_counter_ns()
+            # For HTTP services, try a simple GET
+            if integration.url.startswith(('http://', 'https://')):
+                response = await self._get_http_client().get(integration.url)
+                latency = (time.perf_counter_ns() - start_ns) // 1_000_000
+                return ConnectionTestResult(
+                    service_name=service_name,
+                    success=response.status_code < 500,
+                    latency_ms=latency,
+                    tested_at=now
+                )
+            else:
+                # For non-HTTP (db connections), just report as not testable via HTTP
+                return ConnectionTestResult(
+                    service_name=service_name,
+                    success=True,
+                    error_message="Database connection testing not implemented",
+                    tested_at=now
+                )
         except Exception as e:
             return ConnectionTestResult(
                 service_name=service_name,
                 success=False,
                 error_message=str(e),
-                tested_at=datetime.utcnow()
+                tested_at=now
             )
 
     # =========================================================================
     # IMPORT / EXPORT
     # =========================================================================
 
-    async def export_settings(self) -> tuple[bytes, str]:
-        """Exporte les paramètres en JSON avec checksum."""
+    async def export_settings(self) -> tuple[Iterator[bytes], str]:
+        """
+        Exporte les paramètres en JSON avec checksum.
+
+        Le JSON est produit section par section pour être streamé sans
+        matérialiser le document complet; le checksum est mis en cache
+        jusqu'à la prochaine modification.
+
+        Returns:
+            (itérateur des morceaux JSON, checksum)
+        """
+        # Published snapshots are never mutated (copy-on-write): this one
+        # stays stable for the duration of the stream
         settings = await self.get_all_settings()
-        content = settings.model_dump_json(indent=2)
-        checksum = hashlib.sha256(content.encode()).hexdigest()[:16]
-        return content.encode('utf-8'), checksum
+        checksum = self._etags.get("export")
+        if checksum is None:
+            digest = hashlib.blake2b(digest_size=CHECKSUM_DIGEST_SIZE)
+            for chunk in self._iter_export_chunks(settings):
+                digest.update(chunk)
+            checksum = self._etags["export"] = digest.hexdigest()
+        return self._iter_export_chunks(settings), checksum
+
+    @staticmethod
+    def _iter_export_chunks(settings: AllSettings) -> Iterator[bytes]:
+        """Sérialise les paramètres en JSON, une section à la fois."""
+        yield b"{"
+        for i, name in enumerate(AllSettings.model_fields):
+            if i:
+                yield b","
+            # '{"name":value}' without its braces
+            yield settings.model_dump_json(include={name})[1:-1].encode("utf-8")
+        yield b"}"
 
     async def import_settings(
         self,
         content: bytes,
         user_id: Optional[str] = None,
         user_email: Optional[str] = None,
-        ip_address: Optional[str] = None
+        ip_address: Optional[str] = None,
+        parsed: Optional[AllSettings] = None
     ) -> ImportExportResult:
-        """Importe les paramètres depuis un JSON."""
+        """
+        Importe les paramètres depuis un JSON.
+
+        `parsed` permet de fournir les paramètres déjà décodés et validés
+        à partir de `content` (évite un second parsing).
+        """
         try:
-            data = json.loads(content.decode('utf-8'))
-            new_settings = AllSettings(**data)
+            new_settings = parsed if parsed is not None else AllSettings(**orjson.loads(content))
 
             # Validate before import
             validation = await self.validate_settings(SettingsUpdateRequest(
@@ -435,8 +694,10 @@ class SettingsService:
             async with self._lock:
                 await self._save_settings(new_settings)
                 self._settings_cache = new_settings
+                self._dump_cache.clear()
+                self._invalidate_rendered()
 
-            checksum = hashlib.sha256(content).hexdigest()[:16]
+            checksum = hashlib.blake2b(content, digest_size=CHECKSUM_DIGEST_SIZE).hexdigest()
             return ImportExportResult(
                 success=True,
                 message="Import successful",
@@ -444,7 +705,7 @@ class SettingsService:
                 checksum=checksum,
                 timestamp=datetime.utcnow()
             )
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             return ImportExportResult(
                 success=False,
                 message=f"Invalid JSON: {e}",
@@ -479,14 +740,30 @@ class SettingsService:
         )
 
         async with self._lock:
-            self._settings_cache = self._get_default_settings()
-            self._settings_cache.updated_at = datetime.utcnow()
-            self._settings_cache.updated_by = user_email or user_id
-            await self._save_settings(self._settings_cache)
-            return self._settings_cache
+            defaults = self._get_default_settings()
+            defaults.updated_at = datetime.utcnow()
+            defaults.updated_by = user_email or user_id
+            await self._save_settings(defaults)
+            self._settings_cache = defaults
+            self._dump_cache.clear()
+            self._invalidate_rendered()
+            return defaults
 
     def _get_default_settings(self) -> AllSettings:
-        """Retourne les paramètres par défaut."""
+        """
+        Retourne les paramètres par défaut (nouvelle instance à chaque appel).
+
+        Les valeurs sont constantes: construites et sérialisées une fois,
+        puis relues depuis le JSON (validation Pydantic compilée).
+        """
+        global _DEFAULT_SETTINGS_JSON
+        if _DEFAULT_SETTINGS_JSON is None:
+            _DEFAULT_SETTINGS_JSON = self._build_default_settings().model_dump_json().encode()
+        return AllSettings.model_validate_json(_DEFAULT_SETTINGS_JSON)
+
+    @staticmethod
+    def _build_default_settings() -> AllSettings:
+        """Construit les paramètres par défaut."""
         settings = AllSettings()
 
         # Initialize default fraud patterns
@@ -547,12 +824,18 @@ class SettingsService:
         user_id: Optional[str] = None,
         user_email: Optional[str] = None,
         ip_address: Optional[str] = None,
-        action: str = "update"
+        action: str = "update",
+        timestamp: Optional[datetime] = None
     ) -> None:
-        """Enregistre une entrée d'audit."""
+        """
+        Enregistre une entrée d'audit.
+
+        `timestamp` permet de dater plusieurs entrées d'une même opération
+        avec une seule lecture d'horloge (maintenant par défaut).
+        """
         entry = SettingsAuditLog(
             id=str(uuid4()),
-            timestamp=datetime.utcnow(),
+            timestamp=timestamp or datetime.utcnow(),
             user_id=user_id,
             user_email=user_email,
             setting_type=setting_type,
@@ -562,43 +845,128 @@ class SettingsService:
             action=action
         )
 
-        # Load existing audit log
-        audit_log = []
-        if self.audit_file.exists():
-            try:
-                async with aiofiles.open(self.audit_file, 'r', encoding='utf-8') as f:
-                    content = await f.read()
-                    audit_log = json.loads(content)
-            except Exception:
-                audit_log = []
-
-        # Add new entry
-        audit_log.append(entry.model_dump(mode='json'))
-
-        # Keep only last 1000 entries
-        audit_log = audit_log[-1000:]
-
-        # Save
-        async with aiofiles.open(self.audit_file, 'w', encoding='utf-8') as f:
-            await f.write(json.dumps(audit_log, indent=2, default=str))
-
-    async def get_audit_log(self, limit: int = 100, offset: int = 0) -> List[SettingsAuditLog]:
-        """Récupère l'historique des modifications."""
-        if not self.audit_file.exists():
-            return []
+        self._audit_buffer.append(entry)
+        self.audit_version += 1
+        if len(self._audit_buffer) >= AUDIT_FLUSH_BATCH_SIZE:
+            await self.flush_audit_log()
+        elif self._audit_flush_task is None or self._audit_flush_task.done():
+            self._audit_flush_task = asyncio.create_task(self._flush_audit_later())
+
+    async def _flush_audit_later(self) -> None:
+        """Écrit le tampon d'audit après un court délai."""
+        await asyncio.sleep(AUDIT_FLUSH_INTERVAL_SECONDS)
+        await self.flush_audit_log()
+
+    async def flush_audit_log(self) -> None:
+        """Ajoute les entrées d'audit en attente au fichier JSONL (une seule écriture)."""
+        async with self._audit_lock:
+            if not self._audit_buffer:
+                return
+            entries, self._audit_buffer = self._audit_buffer, []
+
+            audit_log = await self._load_audit_unlocked()
+
+            new_entries = [entry.model_dump(mode='json') for entry in entries]
+            for entry in new_entries:
+                self._audit_positions[entry["id"]] = len(audit_log)
+                audit_log.append(entry)
+
+            if len(audit_log) > AUDIT_TRIM_THRESHOLD:
+                await self._trim_audit_unlocked()
+            else:
+                await write_bytes(
+                    self.audit_file,
+                    b"".join(orjson.dumps(entry) + b"\n" for entry in new_entries),
+                    append=True
+                )
 
+    async def _trim_audit_unlocked(self) -> None:
+        """Réécrit le fichier d'audit avec les AUDIT_MAX_ENTRIES dernières entrées."""
+        audit_log = self._audit_entries[-AUDIT_MAX_ENTRIES:]
+        self._audit_entries = audit_log
+        self._audit_positions = {e.get("id"): i for i, e in enumerate(audit_log)}
+        await write_bytes(self.audit_file, b"".join(orjson.dumps(entry) + b"\n" for entry in audit_log))
+
+    async def _load_audit_unlocked(self) -> List[dict]:
+        """Charge le fichier d'audit en mémoire (appeler avec le lock d'audit)."""
+        if self._audit_entries is None:
+            audit_log = []
+            if not self.audit_file.exists():
+                await self._migrate_legacy_audit_unlocked()
+            if self.audit_file.exists():
+                content = await read_bytes(self.audit_file)
+                for line in content.splitlines():
+                    try:
+                        audit_log.append(orjson.loads(line))
+                    except orjson.JSONDecodeError:
+                        # Torn last append (crash mid-write)
+                        continue
+            self._audit_entries = audit_log
+            self._audit_positions = {e.get("id"): i for i, e in enumerate(audit_log)}
+        return self._audit_entries
+
+    async def _migrate_legacy_audit_unlocked(self) -> None:
+        """
+        Convertit une fois l'ancien historique JSON (tableau) en JSONL.
+
+        Le fichier d'origine est conservé sous le suffixe .bak.
+        """
+        legacy_file = self.audit_file.with_suffix(".json")
+        if legacy_file == self.audit_file or not legacy_file.exists():
+            return
         try:
-            async with aiofiles.open(self.audit_file, 'r', encoding='utf-8') as f:
-                content = await f.read()
-                data = json.loads(content)
+            legacy_log = orjson.loads(await read_bytes(legacy_file))
+        except orjson.JSONDecodeError as e:
+            print(f"Error migrating legacy audit log {legacy_file}: {e}")
+            return
+        if not isinstance(legacy_log, list):
+            print(f"Error migrating legacy audit log {legacy_file}: not a list")
+            return
+        # Legacy file is oldest first, like the JSONL one
+        await write_bytes(
+            self.audit_file,
+            b"".join(orjson.dumps(entry) + b"\n" for entry in legacy_log[-AUDIT_MAX_ENTRIES:]),
+            fsync=True
+        )
+        legacy_file.rename(legacy_file.with_name(f"{legacy_file.name}.bak"))
+        print(f"Migrated {min(len(legacy_log), AUDIT_MAX_ENTRIES)} audit entries from {legacy_file}")
 
-            # Reverse for most recent first
-            data = list(reversed(data))
+    @property
+    def audit_etag(self) -> str:
+        """ETag HTTP de l'historique d'audit (change à chaque nouvelle entrée)."""
+        return f'"{self._audit_epoch}-{self.audit_version}"'
 
-            # Apply pagination
-            paginated = data[offset:offset + limit]
+    async def get_audit_log(
+        self,
+        limit: int = 100,
+        offset: int = 0,
+        before_id: Optional[str] = None
+    ) -> List[SettingsAuditLog]:
+        """
+        Récupère l'historique des modifications (plus récentes en premier).
+
+        Args:
+            limit: Nombre maximum d'entrées
+            offset: Décalage pour pagination (ignoré si before_id est fourni)
+            before_id: Curseur: retourne les entrées antérieures à cet id
+
+        Returns:
+            Entrées d'audit
+        """
+        await self.flush_audit_log()
+
+        async with self._audit_lock:
+            entries = await self._load_audit_unlocked()
+            if before_id is not None:
+                end = self._audit_positions.get(before_id)
+                if end is None:
+                    return []
+            else:
+                end = len(entries) - offset
+            page = entries[max(0, end - limit):max(0, end)]
 
-            return [SettingsAuditLog(**entry) for entry in paginated]
+        try:
+            return [SettingsAuditLog(**entry) for entry in reversed(page)]
         except Exception:
             return []
 
@@ -610,6 +978,8 @@ class SettingsService:
         """Invalide le cache des paramètres."""
         async with self._lock:
             self._settings_cache = None
+            self._dump_cache.clear()
+            self._invalidate_rendered()
 
     async def reload_settings(self) -> AllSettings:
         """Recharge les paramètres depuis le fichier."""
@@ -620,6 +990,9 @@ class SettingsService:
 # Singleton instance
 _settings_service: Optional[SettingsService] = None
 
+# Default settings serialized on first use (see _get_default_settings)
+_DEFAULT_SETTINGS_JSON: Optional[bytes] = None
+
 
 def get_settings_service() -> SettingsService:
     """Retourne l'instance singleton du service."""
@@ -627,3 +1000,9 @@ def get_settings_service() -> SettingsService:
     if _settings_service is None:
         _settings_service = SettingsService()
     return _settings_service
+
+
+async def close_settings_service() -> None:
+    """Écrit les données en attente et libère les ressources (à l'arrêt de l'application)."""
+    if _settings_service is not None:
+        await _settings_service.close()
@@ -3,9 +3,75 @@ FraudShield AI - WebSocket Manager
 Real-time communication with clients
 """
 
-from typing import Dict, List, Any
+from typing import Deque, Dict, Iterable, List, Any, Optional, Set, Tuple, Union
+from collections import deque
 from fastapi import WebSocket
-import json
+import asyncio
+import orjson
+
+# Pending frames per client. When full, the oldest progress frame is dropped;
+# if only non-droppable frames (alerts, broadcasts) are pending, the client
+# is too slow and gets disconnected
+OUTBOX_SIZE = 64
+
+# Close code sent to a client whose outbox overflowed ("try again later")
+OUTBOX_OVERFLOW_CLOSE_CODE = 1013
+
+# Outbox item: (coalescing key or None, encoded payload). Frames sharing a
+# key (progress of one transaction or batch) supersede each other.
+_Frame = Tuple[Optional[Tuple[str, str]], bytes]
+
+# Fixed-shape frames are filled from byte templates: each field is encoded
+# by orjson on its own (escaping strings), no dict is built per call
+_FRAUD_ALERT_TEMPLATE = (
+    b'{"type":"fraud_alert","transaction_id":%b,"decision":%b,'
+    b'"risk_level":%b,"fraud_probability":%b}'
+)
+_PROGRESS_TEMPLATE = (
+    b'{"type":"progress","transaction_id":%b,"phase":%b,"progress":%b,"message":%b}'
+)
+_BATCH_PROGRESS_TEMPLATE = (
+    b'{"type":"batch_progress","batch_id":%b,"processed":%b,"total":%b,'
+    b'"flagged":%b,"progress":%b}'
+)
+
+
+class _Outbox:
+    """Pending frames of one client, drained by its writer task."""
+
+    __slots__ = ("frames", "ready", "overflowed")
+
+    def __init__(self):
+        self.frames: Deque[_Frame] = deque()
+        self.ready = asyncio.Event()
+        self.overflowed = False
+
+    def push(self, frame: _Frame) -> bool:
+        """
+        Queue a frame without waiting.
+
+        When full, the oldest coalescable (progress) frame makes room; if
+        there is none, the outbox is marked overflowed and False is returned.
+        """
+        frames = self.frames
+        if len(frames) >= OUTBOX_SIZE:
+            for i, (key, _) in enumerate(frames):
+                if key is not None:
+                    del frames[i]
+                    break
+            else:
+                self.overflowed = True
+                return False
+        frames.append(frame)
+        self.ready.set()
+        return True
+
+    def take(self) -> List[_Frame]:
+        """Remove and return every pending frame."""
+        batch = list(self.frames)
+        self.frames.clear()
+        self.ready.clear()
+        return batch
 
 
 class WebSocketManager:
@@ -17,7 +83,21 @@ class WebSocketManager:
 
     def __init__(self):
         """Initialize WebSocket manager."""
-        self.active_connections: Dict[str, WebSocket] = {}
+        self.topics: Dict[str, Set[str]] = {}
+        # Connections as parallel arrays (slot i is one client) plus an
+        # id -> slot index: broadcast walks _outboxes as a flat list.
+        # One outbound queue and one writer task per client: producers never
+        # wait on a socket, and only the writer sends on it
+        self._client_ids: List[str] = []
+        self._sockets: List[WebSocket] = []
+        self._outboxes: List[_Outbox] = []
+        self._writers: List[asyncio.Task] = []
+        self._index: Dict[str, int] = {}
+
+    @property
+    def active_connections(self) -> Dict[str, WebSocket]:
+        """Connected sockets by client ID (snapshot)."""
+        return dict(zip(self._client_ids, self._sockets))
 
     async def connect(self, websocket: WebSocket, client_id: str):
         """
@@ -28,7 +108,21 @@ class WebSocketManager:
             client_id: Client identifier
         """
         await websocket.accept()
-        self.active_connections[client_id] = websocket
+        outbox = _Outbox()
+        writer = asyncio.create_task(self._drain(client_id, websocket, outbox))
+        i = self._index.get(client_id)
+        if i is None:
+            self._index[client_id] = len(self._client_ids)
+            self._client_ids.append(client_id)
+            self._sockets.append(websocket)
+            self._outboxes.append(outbox)
+            self._writers.append(writer)
+        else:
+            # Same id reconnecting: the old writer must not touch the new socket
+            self._writers[i].cancel()
+            self._sockets[i] = websocket
+            self._outboxes[i] = outbox
+            self._writers[i] = writer
         await self.send_personal_message(
             {"type": "connected", "client_id": client_id},
             client_id
@@ -41,34 +135,157 @@ class WebSocketManager:
         Args:
             client_id: Client identifier
         """
-        if client_id in self.active_connections:
-            del self.active_connections[client_id]
+        self._evict((client_id,))
+
+    def _evict(self, client_ids: Iterable[str]):
+        """
+        Remove several connections in one pass over the topics.
+
+        Topics left without subscribers are dropped.
+
+        Args:
+            client_ids: Client identifiers
+        """
+        dead = set(client_ids)
+        current = asyncio.current_task()
+        for client_id in dead:
+            i = self._index.pop(client_id, None)
+            if i is None:
+                continue
+            writer = self._writers[i]
+            if writer is not current:
+                writer.cancel()
+            # Swap-remove: the last slot moves into the freed one
+            last = len(self._client_ids) - 1
+            if i != last:
+                moved = self._client_ids[i] = self._client_ids[last]
+                self._sockets[i] = self._sockets[last]
+                self._outboxes[i] = self._outboxes[last]
+                self._writers[i] = self._writers[last]
+                self._index[moved] = i
+            self._client_ids.pop()
+            self._sockets.pop()
+            self._outboxes.pop()
+            self._writers.pop()
+        for topic, subscribers in list(self.topics.items()):
+            subscribers -= dead
+            if not subscribers:
+                del self.topics[topic]
+
+    def subscribe(self, client_id: str, topic: str):
+        """
+        Subscribe a client to a broadcast topic.
+
+        Args:
+            client_id: Client identifier
+            topic: Topic name
+        """
+        self.topics.setdefault(topic, set()).add(client_id)
 
-    async def send_personal_message(self, message: Dict[str, Any], client_id: str):
+    def unsubscribe(self, client_id: str, topic: str):
+        """
+        Unsubscribe a client from a broadcast topic.
+
+        Args:
+            client_id: Client identifier
+            topic: Topic name
+        """
+        subscribers = self.topics.get(topic)
+        if subscribers is not None:
+            subscribers.discard(client_id)
+
+    @staticmethod
+    async def _send(websocket: WebSocket, payload: bytes):
+        """Send an encoded JSON payload as a binary frame (no re-encoding)."""
+        await websocket.send_bytes(payload)
+
+    async def _drain(self, client_id: str, websocket: WebSocket, outbox: _Outbox):
+        """
+        Writer task: send queued frames, coalescing superseded progress frames.
+
+        Args:
+            client_id: Client identifier
+            websocket: WebSocket connection
+            outbox: Client's pending frames
+        """
+        try:
+            while True:
+                await outbox.ready.wait()
+                batch = outbox.take()
+
+                # Keep only the last frame of each coalescing key, in queue order
+                last = {key: i for i, (key, _) in enumerate(batch) if key is not None}
+                for i, (key, payload) in enumerate(batch):
+                    if key is None or last[key] == i:
+                        await self._send(websocket, payload)
+        except asyncio.CancelledError:
+            if outbox.overflowed:
+                # Evicted for being too slow: tell the client why
+                try:
+                    await websocket.close(code=OUTBOX_OVERFLOW_CLOSE_CODE)
+                except Exception:
+                    pass
+            raise
+        except Exception:
+            # Client went away: stop writing
+            pass
+        # Forget the client (unless it already reconnected with a new writer)
+        i = self._index.get(client_id)
+        if i is not None and self._writers[i] is asyncio.current_task():
+            self.disconnect(client_id)
+
+    async def send_personal_message(
+        self,
+        message: Union[Dict[str, Any], bytes],
+        client_id: str,
+        coalesce_key: Optional[Tuple[str, str]] = None
+    ):
         """
         Send message to specific client.
 
+        The message is queued for the client's writer task; a client whose
+        outbox is full of non-droppable frames is disconnected.
+
         Args:
-            message: Message to send
+            message: Message to send, or an already-encoded JSON payload
             client_id: Target client
+            coalesce_key: Frames with the same key replace older unsent ones
         """
-        if client_id in self.active_connections:
-            websocket = self.active_connections[client_id]
-            await websocket.send_text(json.dumps(message))
+        i = self._index.get(client_id)
+        if i is not None:
+            payload = message if isinstance(message, bytes) else orjson.dumps(message)
+            if not self._outboxes[i].push((coalesce_key, payload)):
+                self.disconnect(client_id)
 
-    async def broadcast(self, message: Dict[str, Any]):
+    async def broadcast(self, message: Dict[str, Any], topic: Optional[str] = None):
         """
         Broadcast message to all connected clients.
 
+        The payload is queued once per client, so one slow client does not
+        delay the others. Clients whose outbox is full of non-droppable
+        frames are disconnected here, those whose send fails by their writer
+        task.
+
         Args:
             message: Message to broadcast
+            topic: Optional topic; only its subscribers receive the message
         """
-        for client_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_text(json.dumps(message))
-            except Exception:
-                # Client might have disconnected
-                pass
+        if topic is None:
+            # Enqueueing never awaits: the live lists can be walked directly
+            targets = zip(self._client_ids, self._outboxes)
+        else:
+            index = self._index
+            targets = [
+                (client_id, self._outboxes[index[client_id]])
+                for client_id in self.topics.get(topic, ())
+                if client_id in index
+            ]
+
+        # Encoded once, the same bytes go to every client
+        frame = (None, orjson.dumps(message))
+        overflowed = [client_id for client_id, outbox in targets if not outbox.push(frame)]
+        if overflowed:
+            self._evict(overflowed)
 
     async def send_fraud_alert(
         self,
@@ -88,14 +305,11 @@ class WebSocketManager:
             risk_level: Risk level
             fraud_probability: Fraud probability
         """
+        dumps = orjson.dumps
         await self.send_personal_message(
-            {
-                "type": "fraud_alert",
-                "transaction_id": transaction_id,
-                "decision": decision,
-                "risk_level": risk_level,
-                "fraud_probability": fraud_probability,
-            },
+            _FRAUD_ALERT_TEMPLATE % (
+                dumps(transaction_id), dumps(decision), dumps(risk_level), dumps(fraud_probability)
+            ),
             client_id
         )
 
@@ -117,15 +331,11 @@ class WebSocketManager:
             progress: Progress percentage
             message: Optional status message
         """
+        dumps = orjson.dumps
         await self.send_personal_message(
-            {
-                "type": "progress",
-                "transaction_id": transaction_id,
-                "phase": phase,
-                "progress": progress,
-                "message": message,
-            },
-            client_id
+            _PROGRESS_TEMPLATE % (dumps(transaction_id), dumps(phase), dumps(progress), dumps(message)),
+            client_id,
+            coalesce_key=("progress", transaction_id)
         )
 
     async def send_batch_progress(
@@ -146,22 +356,20 @@ class WebSocketManager:
             total: Total transactions
             flagged: Flagged count
         """
+        dumps = orjson.dumps
         await self.send_personal_message(
-            {
-                "type": "batch_progress",
-                "batch_id": batch_id,
-                "processed": processed,
-                "total": total,
-                "flagged": flagged,
-                "progress": processed / total if total > 0 else 0,
-            },
-            client_id
+            _BATCH_PROGRESS_TEMPLATE % (
+                dumps(batch_id), dumps(processed), dumps(total), dumps(flagged),
+                dumps(processed / total if total > 0 else 0)
+            ),
+            client_id,
+            coalesce_key=("batch_progress", batch_id)
         )
 
     def get_connected_clients(self) -> List[str]:
         """Get list of connected client IDs."""
-        return list(self.active_connections.keys())
+        return list(self._client_ids)
 
     def get_connection_count(self) -> int:
         """Get number of active connections."""
-        return len(self.active_connections)
+        return len(self._client_ids)
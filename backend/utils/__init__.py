@@ -0,0 +1,9 @@
+"""
+FraudShield AI - Backend Utilities
+Shared helpers for routers and services
+"""
+
+from .cache import ttl_cache
+from .clock import now_iso
+
+__all__ = ["now_iso", "ttl_cache"]
@@ -0,0 +1,36 @@
+"""
+FraudShield AI - Statistics Kernels
+Numeric generation of mock fraud statistics
+"""
+
+import numpy as np
+
+# Column layout of gen_buckets output
+TRANSACTIONS, FLAGGED, CONFIRMED, AMOUNT, FLAGGED_AMOUNT = range(5)
+
+
+def gen_buckets(n, seed):
+    """
+    Generate n statistics buckets.
+
+    Whole-column draws from a local generator: no per-bucket Python loop,
+    and NumPy's global RNG is left untouched.
+
+    Args:
+        n: Number of buckets
+        seed: RNG seed
+
+    Returns:
+        (n, 5) float array: transactions, flagged, confirmed, amount,
+        flagged_amount
+    """
+    rng = np.random.default_rng(seed)
+    out = np.empty((n, 5))
+    transactions = rng.integers(1100, 1701, size=n)
+    flagged = np.floor(transactions * rng.uniform(0.015, 0.035, size=n))
+    out[:, TRANSACTIONS] = transactions
+    out[:, FLAGGED] = flagged
+    out[:, CONFIRMED] = np.floor(flagged * rng.uniform(0.65, 0.80, size=n))
+    out[:, AMOUNT] = transactions * rng.uniform(750, 950, size=n)
+    out[:, FLAGGED_AMOUNT] = flagged * rng.uniform(2000, 3500, size=n)
+    return out
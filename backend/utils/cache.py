@@ -0,0 +1,76 @@
+"""
+FraudShield AI - Response Cache
+In-process TTL cache for read-only endpoints
+"""
+
+import asyncio
+import time
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+def ttl_cache(
+    ttl_seconds: float = 60.0,
+    maxsize: int = 128,
+    exclude: Iterable[str] = ("service",),
+    key: Optional[Callable[..., Hashable]] = None,
+) -> Callable:
+    """
+    Cache the result of an async endpoint for a fixed time window.
+
+    The cache key is built from the keyword arguments FastAPI passes to the
+    endpoint, minus injected dependencies listed in `exclude`. The wrapped
+    function keeps its signature, so FastAPI still resolves query parameters
+    and dependencies from it.
+
+    Concurrent misses on the same key share a single call: the first caller
+    runs the function, the others await its result.
+
+    Args:
+        ttl_seconds: Lifetime of a cached result
+        maxsize: Maximum number of cached keys (oldest entry evicted first)
+        exclude: Parameter names left out of the cache key
+        key: Custom key builder, called with the function's arguments
+            (for unhashable arguments); replaces the default key
+
+    Returns:
+        Decorator for async endpoints
+    """
+    excluded = frozenset(exclude)
+
+    def decorator(func: Callable) -> Callable:
+        entries: Dict[Hashable, Tuple[float, Any]] = {}
+        in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        async def load(cache_key: Hashable, args: Tuple, kwargs: Dict) -> Any:
+            result = await func(*args, **kwargs)
+            entries.pop(cache_key, None)
+            if len(entries) >= maxsize:
+                entries.pop(next(iter(entries)))
+            entries[cache_key] = (time.monotonic() + ttl_seconds, result)
+            return result
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            if key is None:
+                cache_key = args + tuple(sorted(
+                    (name, value) for name, value in kwargs.items() if name not in excluded
+                ))
+            else:
+                cache_key = key(*args, **kwargs)
+            cached = entries.get(cache_key)
+            if cached is not None and time.monotonic() < cached[0]:
+                return cached[1]
+
+            task = in_flight.get(cache_key)
+            if task is None:
+                task = asyncio.ensure_future(load(cache_key, args, kwargs))
+                in_flight[cache_key] = task
+                task.add_done_callback(lambda _: in_flight.pop(cache_key, None))
+            # Shielded: a cancelled caller must not cancel the shared call
+            return await asyncio.shield(task)
+
+        wrapper.cache_clear = entries.clear
+        return wrapper
+
+    return decorator
@@ -0,0 +1,26 @@
+"""
+FraudShield AI - Clock Helpers
+Cached timestamps for hot request paths
+"""
+
+import time
+from datetime import datetime
+
+_cached_ms: int = -1
+_cached_iso: str = ""
+
+
+def now_iso() -> str:
+    """
+    Current local time in ISO format.
+
+    Equivalent to datetime.now().isoformat() but formatted at most once
+    per millisecond, so requests landing in the same millisecond share
+    the string.
+    """
+    global _cached_ms, _cached_iso
+    ms = time.time_ns() // 1_000_000
+    if ms != _cached_ms:
+        _cached_iso = datetime.fromtimestamp(ms / 1000).isoformat()
+        _cached_ms = ms
+    return _cached_iso
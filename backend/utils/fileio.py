@@ -0,0 +1,93 @@
+"""
+FraudShield AI - Async File I/O
+Whole-file reads and writes through caio (io_uring / Linux AIO) when it is
+installed, falling back to aiofiles (thread pool) otherwise
+"""
+
+import os
+from typing import Optional
+
+import aiofiles
+
+try:
+    import caio
+except ImportError:  # pragma: no cover - caio is an optional accelerator
+    caio = None
+
+CAIO_MAX_REQUESTS = 64
+
+# Created lazily: the context binds to the running event loop
+_context: Optional["caio.AsyncioContext"] = None
+
+
+def _get_context() -> "caio.AsyncioContext":
+    global _context
+    if _context is None:
+        _context = caio.AsyncioContext(max_requests=CAIO_MAX_REQUESTS)
+    return _context
+
+
+async def read_bytes(path: os.PathLike) -> bytes:
+    """
+    Read a whole file.
+
+    Args:
+        path: File to read
+
+    Returns:
+        File content
+    """
+    if caio is None:
+        async with aiofiles.open(path, 'rb') as f:
+            return await f.read()
+
+    ctx = _get_context()
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        chunks = []
+        offset = 0
+        while offset < size:
+            chunk = await ctx.read(size - offset, fd, offset)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            offset += len(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
+
+
+async def write_bytes(path: os.PathLike, data: bytes, append: bool = False, fsync: bool = False) -> None:
+    """
+    Write (or append) data to a file, creating it if needed.
+
+    Args:
+        path: File to write
+        data: Content
+        append: Add at the end of the file instead of replacing it
+        fsync: Flush to stable storage before returning
+    """
+    if caio is None:
+        async with aiofiles.open(path, 'ab' if append else 'wb') as f:
+            await f.write(data)
+            if fsync:
+                await f.flush()
+                os.fsync(f.fileno())
+        return
+
+    ctx = _get_context()
+    flags = os.O_WRONLY | os.O_CREAT | (0 if append else os.O_TRUNC)
+    fd = os.open(path, flags, 0o644)
+    try:
+        # Explicit offset: O_APPEND semantics differ between pwrite and io_uring
+        offset = os.fstat(fd).st_size if append else 0
+        view = memoryview(data)
+        while view:
+            written = await ctx.write(bytes(view), fd, offset)
+            offset += written
+            view = view[written:]
+        if fsync:
+            await ctx.fsync(fd)
+    finally:
+        os.close(fd)
@@ -34,7 +34,8 @@ class AgentConfig:
         return config
 
 
-@dataclass
+# slots: one context is allocated per agent call, keep it small (no __dict__)
+@dataclass(slots=True)
 class AgentContext:
     """Shared context for agent execution."""
     transaction_id: str = ""
@@ -8,8 +8,9 @@ Uses:
 - Template matching for document classification
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
+import asyncio
 
 from .base_agent import (
     AgentConfig,
@@ -106,74 +107,22 @@ Retourne un JSON structuré avec:
         Returns:
             Comprehensive document analysis results
         """
+        # Documents are independent: run the blocking tool calls for each
+        # one in a worker thread and analyze them concurrently
+        if len(documents) > 1:
+            analyses = await asyncio.gather(*(
+                asyncio.to_thread(self._analyze_single, doc) for doc in documents
+            ))
+        else:
+            analyses = [self._analyze_single(doc) for doc in documents]
+
         results = []
         overall_score = 1.0
         risk_indicators = []
-
-        for doc in documents:
-            doc_uri = doc.get("uri", "")
-            doc_type = doc.get("type")
-
-            # Step 1: Classify document
-            classification = classify_document(doc_uri)
-
-            # Step 2: Extract text
-            ocr_result = ocr_extract(doc_uri)
-
-            # Step 3: Detect tampering
-            tampering_result = detect_tampering(doc_uri)
-
-            # Step 4: Extract entities
-            entities_result = extract_entities(doc_uri)
-
-            # Step 5: Validate if medical document
-            validation_result = None
-            if classification.get("detected_type") in ["ordonnance", "certificat_medical"]:
-                validation_result = validate_medical_document(
-                    doc_uri,
-                    classification.get("detected_type")
-                )
-
-            # Compile document result
-            doc_result = {
-                "document_id": doc.get("id", ""),
-                "document_uri": doc_uri,
-                "classification": classification,
-                "ocr": {
-                    "text_length": len(ocr_result.get("text_extracted", "")),
-                    "confidence": ocr_result.get("confidence", 0),
-                },
-                "tampering": {
-                    "detected": tampering_result.get("tampering_detected", False),
-                    "score": tampering_result.get("authenticity_score", 0),
-                    "warnings": tampering_result.get("warnings", []),
-                },
-                "entities": entities_result.get("entities_found", {}),
-                "validation": validation_result,
-            }
-
+        for doc_result, auth_score, doc_indicators in analyses:
             results.append(doc_result)
-
-            # Update overall score
-            auth_score = tampering_result.get("authenticity_score", 1.0)
             overall_score = min(overall_score, auth_score)
-
-            # Collect risk indicators
-            if tampering_result.get("tampering_detected"):
-                risk_indicators.append({
-                    "type": "document_tampering",
-                    "severity": "high",
-                    "document_id": doc.get("id", ""),
-                    "description": "Falsification documentaire détectée"
-                })
-
-            for warning in tampering_result.get("warnings", []):
-                risk_indicators.append({
-                    "type": "document_warning",
-                    "severity": warning.get("severity", "medium"),
-                    "document_id": doc.get("id", ""),
-                    "description": warning.get("details", "")
-                })
+            risk_indicators.extend(doc_indicators)
 
         # Determine recommendation
         if overall_score < 0.5:
@@ -195,6 +144,80 @@ Retourne un JSON structuré avec:
             "elapsed_ms": context.elapsed_time_ms()
         }
 
+    def _analyze_single(
+        self,
+        doc: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], float, List[Dict[str, Any]]]:
+        """
+        Analyze one document.
+
+        Args:
+            doc: Document metadata with URI
+
+        Returns:
+            (document result, authenticity score, risk indicators)
+        """
+        doc_uri = doc.get("uri", "")
+        doc_type = doc.get("type")
+
+        # Step 1: Classify document
+        classification = classify_document(doc_uri)
+
+        # Step 2: Extract text
+        ocr_result = ocr_extract(doc_uri)
+
+        # Step 3: Detect tampering
+        tampering_result = detect_tampering(doc_uri)
+
+        # Step 4: Extract entities
+        entities_result = extract_entities(doc_uri)
+
+        # Step 5: Validate if medical document
+        validation_result = None
+        if classification.get("detected_type") in ["ordonnance", "certificat_medical"]:
+            validation_result = validate_medical_document(
+                doc_uri,
+                classification.get("detected_type")
+            )
+
+        # Compile document result
+        doc_result = {
+            "document_id": doc.get("id", ""),
+            "document_uri": doc_uri,
+            "classification": classification,
+            "ocr": {
+                "text_length": len(ocr_result.get("text_extracted", "")),
+                "confidence": ocr_result.get("confidence", 0),
+            },
+            "tampering": {
+                "detected": tampering_result.get("tampering_detected", False),
+                "score": tampering_result.get("authenticity_score", 0),
+                "warnings": tampering_result.get("warnings", []),
+            },
+            "entities": entities_result.get("entities_found", {}),
+            "validation": validation_result,
+        }
+
+        # Collect risk indicators
+        risk_indicators = []
+        if tampering_result.get("tampering_detected"):
+            risk_indicators.append({
+                "type": "document_tampering",
+                "severity": "high",
+                "document_id": doc.get("id", ""),
+                "description": "Falsification documentaire détectée"
+            })
+
+        for warning in tampering_result.get("warnings", []):
+            risk_indicators.append({
+                "type": "document_warning",
+                "severity": warning.get("severity", "medium"),
+                "document_id": doc.get("id", ""),
+                "description": warning.get("details", "")
+            })
+
+        return doc_result, tampering_result.get("authenticity_score", 1.0), risk_indicators
+
     async def quick_check(
         self,
         document_uri: str
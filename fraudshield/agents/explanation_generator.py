@@ -8,6 +8,7 @@ Implements XAI (Explainable AI) requirements:
 - Investigation report creation
 """
 
+import asyncio
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
@@ -286,7 +287,9 @@ Retourne un JSON structuré avec:
         Returns:
             Complete investigation report
         """
-        report = create_investigation_report(case_id, investigation_data)
+        # Report assembly is synchronous string work: build it in a worker
+        # thread so it does not block the event loop
+        report = await asyncio.to_thread(create_investigation_report, case_id, investigation_data)
 
         return {
             **report,
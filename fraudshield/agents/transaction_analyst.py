@@ -9,7 +9,8 @@ Implements the LLM+RL hybrid approach:
 4. Score using cost-sensitive RL policy
 """
 
-from typing import Dict, Any, List, Optional
+import asyncio
+from typing import Dict, Any, AsyncIterator, List, Optional
 from datetime import datetime
 
 from .base_agent import (
@@ -27,6 +28,7 @@ from ..tools.fraud_tools import (
     get_transaction_history,
 )
 from ..config.rewards import REWARD_CONFIG, classify_risk, should_flag
+from ..config.settings import get_settings
 
 
 class TransactionAnalystAgent:
@@ -227,21 +229,24 @@ Retourne un JSON structuré avec:
         Returns:
             Batch analysis results
         """
+        # Transactions are independent: analyze them concurrently, with at
+        # most batch_concurrency analyses in flight
+        semaphore = asyncio.Semaphore(get_settings().batch_concurrency)
+
+        async def analyze_one(tx: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze(tx, context, include_history=False)
+
+        analyses = await asyncio.gather(*(analyze_one(tx) for tx in transactions))
+
+        # Entries and aggregates in a single pass over the analyses
         results = []
         flagged = 0
         total_fraud_prob = 0
-
-        for tx in transactions:
-            result = await self.analyze(tx, context, include_history=False)
-            results.append({
-                "transaction_id": result.get("transaction_id"),
-                "fraud_probability": result.get("fraud_probability"),
-                "risk_level": result.get("risk_level"),
-                "recommended_action": result.get("recommended_action"),
-            })
-
-            if result.get("recommended_action") == "FLAG":
-                flagged += 1
+        for result in analyses:
+            entry = self._batch_entry(result)
+            results.append(entry)
+            flagged += entry["recommended_action"] == "FLAG"
             total_fraud_prob += result.get("fraud_probability", 0)
 
         return {
@@ -255,6 +260,46 @@ Retourne un JSON structuré avec:
             "elapsed_ms": context.elapsed_time_ms()
         }
 
+    async def iter_batch(
+        self,
+        transactions: List[Dict[str, Any]],
+        context: AgentContext
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Analyze multiple transactions, yielding each result as it completes.
+
+        Args:
+            transactions: List of transactions
+            context: Agent execution context
+
+        Yields:
+            Per-transaction batch entries, in completion order
+        """
+        semaphore = asyncio.Semaphore(get_settings().batch_concurrency)
+
+        async def analyze_one(tx: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.analyze(tx, context, include_history=False)
+
+        tasks = [asyncio.ensure_future(analyze_one(tx)) for tx in transactions]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield self._batch_entry(await next_done)
+        finally:
+            # Consumer went away (e.g. client disconnected): drop pending work
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _batch_entry(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce a full analysis to its batch summary entry."""
+        return {
+            "transaction_id": result.get("transaction_id"),
+            "fraud_probability": result.get("fraud_probability"),
+            "risk_level": result.get("risk_level"),
+            "recommended_action": result.get("recommended_action"),
+        }
+
     def get_adk_config(self) -> Dict[str, Any]:
         """Get ADK Agent configuration."""
         return {
@@ -122,6 +122,28 @@ class FraudShieldApp:
         Returns:
             Fraud detection result
         """
+        result = await self.analyze_transaction(transaction, documents, beneficiary, workflow)
+        return await self.complete_transaction(result, transaction, user_id)
+
+    async def analyze_transaction(
+        self,
+        transaction: Dict[str, Any],
+        documents: Optional[list] = None,
+        beneficiary: Optional[Dict[str, Any]] = None,
+        workflow: str = "standard"
+    ) -> Dict[str, Any]:
+        """
+        Run the orchestrator on a transaction (no notification, no RL bookkeeping).
+
+        Args:
+            transaction: Transaction data
+            documents: Optional list of documents
+            beneficiary: Optional beneficiary data
+            workflow: Workflow type (quick, standard, investigation, batch)
+
+        Returns:
+            Orchestrator result
+        """
         # Prepare request
         request = {
             "transaction_id": transaction.get("transaction_id", ""),
@@ -139,8 +161,25 @@ class FraudShieldApp:
         }.get(workflow, WorkflowType.STANDARD)
 
         # Process with orchestrator
-        result = await self.orchestrator.process(request, workflow_type)
+        return await self.orchestrator.process(request, workflow_type)
+
+    async def complete_transaction(
+        self,
+        result: Dict[str, Any],
+        transaction: Dict[str, Any],
+        user_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Notify, record the RL experience and build the response for an analysis.
 
+        Args:
+            result: Orchestrator result (from analyze_transaction)
+            transaction: Transaction data
+            user_id: User ID for notifications
+
+        Returns:
+            Fraud detection result
+        """
         # Build UI response
         ui_response = self.response_builder.build_fraud_detection_response(result)
 
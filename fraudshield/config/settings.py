@@ -64,6 +64,9 @@ class Settings:
     # Feature Store
     feature_store_id: str = field(default_factory=lambda: os.getenv("FEATURE_STORE_ID", "fraud_detection_features"))
 
+    # Batch Processing
+    batch_concurrency: int = field(default_factory=lambda: int(os.getenv("BATCH_CONCURRENCY", "32")))
+
     # Logging
     log_level: str = field(default_factory=lambda: os.getenv("LOG_LEVEL", "INFO"))
 